@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Vote Latency Benchmark
+
+Measures how long POST /api/vote takes as the vote table grows, to check
+that the composite vote indexes keep latency flat. Uses a throwaway
+SQLite database; nothing is written to the application database.
+
+Usage:
+    python benchmark_votes.py [--sizes 10000,100000,1000000] [--requests 200] [--without-indexes]
+
+--without-indexes drops the non-unique vote indexes only; the unique ones
+must stay because votes are upserted with ON CONFLICT on them.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from flask import Flask
+from sqlalchemy import text
+from src.models.user import db, User
+from src.models.session_invitation import SessionInvitation
+from src.models.voting_session import VotingSession, JiraIssue, Vote, RemovedIssue
+from src.models.team import Team, TeamMembership
+from src.models.api_key import ApiKey, ApiKeyUsage
+from src.models.job import Job
+from src.models.outbound_email import OutboundEmail
+from src.models.migrations import upgrade_schema
+from jira import jira_bp
+
+# Indexes dropped by --without-indexes, to compare against the unindexed table. The unique
+# indexes ux_vote_session_issue_user/voter stay: the vote upsert's ON CONFLICT needs them.
+VOTE_INDEXES = ['ix_vote_session_version', 'ix_vote_session_user', 'ix_vote_session_voter']
+
+def create_benchmark_app(database_path):
+    """Create a minimal Flask app backed by a temporary SQLite database"""
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = 'benchmark'
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{database_path}'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SESSION_CACHE_MAX_BYTES'] = 0
+    app.register_blueprint(jira_bp, url_prefix='/api')
+    db.init_app(app)
+
+    with app.app_context():
+        upgrade_schema()
+
+    return app
+
+def create_session():
+    """Add an open voting session and return its session ID"""
+    session_id = str(uuid.uuid4())
+    db.session.add(VotingSession(
+        session_id=session_id,
+        jira_url='https://jira.example.com',
+        jira_token='benchmark',
+        jira_query='project = BENCH',
+        creator_name='benchmark'
+    ))
+    db.session.commit()
+    return session_id
+
+def grow_vote_table(target_rows, sessions_per_batch=100, votes_per_session=1000):
+    """Insert filler votes spread over many sessions until the table has `target_rows` rows"""
+    current_rows = db.session.execute(text('SELECT COUNT(*) FROM vote')).scalar()
+    while current_rows < target_rows:
+        rows = []
+        for _ in range(sessions_per_batch):
+            session_id = str(uuid.uuid4())
+            for vote_number in range(votes_per_session):
+                rows.append({
+                    'session_id': session_id,
+                    'issue_key': f'FILL-{vote_number % 50}',
+                    'voter_name': f'voter-{vote_number // 50}',
+                    'estimation': '3'
+                })
+                if current_rows + len(rows) >= target_rows:
+                    break
+            if current_rows + len(rows) >= target_rows:
+                break
+
+        db.session.execute(
+            text('INSERT INTO vote (session_id, issue_key, voter_name, estimation, version) '
+                 'VALUES (:session_id, :issue_key, :voter_name, :estimation, 0)'),
+            rows
+        )
+        db.session.commit()
+        current_rows += len(rows)
+
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
+    return current_rows
+
+def measure_votes(client, session_id, request_count):
+    """Send new votes and vote changes, returning latencies in milliseconds"""
+    latencies = []
+    for request_number in range(request_count):
+        payload = {
+            'session_id': session_id,
+            'issue_key': f'BENCH-{request_number % 20}',
+            'voter_name': f'bench-voter-{request_number % 10}',
+            'estimation': str(request_number % 13 + 1)
+        }
+        start = time.perf_counter()
+        response = client.post('/api/vote', json=payload)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            raise RuntimeError(f'Vote failed: {response.status_code} {response.get_data(as_text=True)}')
+    return latencies
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark vote latency against vote table size')
+    parser.add_argument('--sizes', default='10000,100000,1000000', help='Comma-separated vote table sizes')
+    parser.add_argument('--requests', type=int, default=200, help='Votes sent at each size')
+    parser.add_argument('--without-indexes', action='store_true', help='Drop the non-unique vote indexes first, for comparison (the unique ones the vote upsert needs stay)')
+    args = parser.parse_args()
+
+    sizes = sorted(int(size) for size in args.sizes.split(','))
+
+    print("🗳️  Vote Latency Benchmark")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = create_benchmark_app(os.path.join(directory, 'benchmark.db'))
+        client = app.test_client()
+
+        with app.app_context():
+            if args.without_indexes:
+                for index_name in VOTE_INDEXES:
+                    db.session.execute(text(f'DROP INDEX IF EXISTS {index_name}'))
+                db.session.commit()
+                print("⚠️  Non-unique vote indexes dropped")
+
+            print(f"{'votes':>12} {'mean ms':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}")
+            for size in sizes:
+                grow_vote_table(size)
+                session_id = create_session()
+                latencies = measure_votes(client, session_id, args.requests)
+                print(f"{size:>12,} {statistics.mean(latencies):>10.2f} {percentile(latencies, 0.5):>10.2f} "
+                      f"{percentile(latencies, 0.95):>10.2f} {percentile(latencies, 0.99):>10.2f}")
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
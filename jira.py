@@ -1,13 +1,142 @@
+import re
 import uuid
+import math
 import time
+import itertools
+from datetime import datetime, timezone
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
-from flask import Blueprint, request, jsonify, session, current_app
+from sqlalchemy import select, text
+from flask import Blueprint, Response, request, jsonify, current_app, has_app_context
 from src.models.user import db, User
-from src.models.voting_session import VotingSession, JiraIssue, Vote
+from src.models.voting_session import VotingSession, JiraIssue, Vote, RemovedIssue
+from src.models.job import Job
 from src.services.email_service import send_first_vote_notification_email
+from src.services.jira_client import get_jira_client
+from src.services.rate_limiter import get_rate_limiter
+from src.services.job_queue import job_queue, JobFailed, DuplicateJob
+from src.services.session_events import session_events
+from src.services.http_cache import make_etag, not_modified, add_etag
+from src.services.session_cache import session_cache
+from src.services.auth_resolver import get_current_user, get_current_user_id
 
 jira_bp = Blueprint('jira', __name__)
 
+# Jira caps maxResults per search page, so large JQL results are fetched page by page
+JIRA_SEARCH_PAGE_SIZE = 50
+
+# Default number of search pages requested from Jira in parallel (JIRA_FETCH_CONCURRENCY)
+JIRA_FETCH_CONCURRENCY = 4
+
+# Default number of parallel Jira updates when closing a session (JIRA_WRITE_CONCURRENCY)
+JIRA_WRITE_CONCURRENCY = 4
+
+# Jira bulk edit settings for session close (JIRA_BULK_WRITE is 'auto' or 'off')
+JIRA_BULK_WRITE = 'auto'
+JIRA_BULK_MIN_ISSUES = 2  # Smaller groups are written with plain per-issue PUTs
+JIRA_BULK_MAX_ISSUES = 1000  # Jira accepts at most this many issues per bulk edit
+JIRA_BULK_TIMEOUT = 120  # Seconds to wait for a bulk edit task to finish
+
+# Number of issues written to the database per flush when ingesting search results
+JIRA_ISSUE_CHUNK_SIZE = 100
+
+JIRA_ISSUE_FIELDS = 'summary,description,status,assignee,priority,updated,customfield_12315940,customfield_12310243'
+
+# Issue keys looked up per `key in (...)` search when refreshing a batch of tasks
+JIRA_KEY_BATCH_SIZE = 50
+
+# Maximum number of issue keys accepted by one refresh-tasks request
+MAX_REFRESH_TASKS = 1000
+
+# Extra minutes added to the incremental refresh window to absorb clock drift and slow indexing
+JIRA_SYNC_MARGIN_MINUTES = 5
+
+def chunked(iterable, size):
+    """Split an iterable into lists of at most size items without materializing it"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def parse_jira_datetime(value):
+    """Parse a Jira timestamp such as 2024-01-31T09:15:00.000+0100 into a naive UTC datetime"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f%z')
+    except ValueError:
+        return None
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None)
+
+def jira_issue_values(issue):
+    """Map a Jira issue to JiraIssue column values"""
+    fields = issue['fields']
+    return {
+        'jira_id': issue.get('id'),
+        'issue_title': fields['summary'],
+        'issue_description': fields.get('description', ''),
+        'acceptance_criteria': fields.get('customfield_12315940', ''),
+        'current_story_points': parse_story_points(fields),
+        'jira_updated': parse_jira_datetime(fields.get('updated'))
+    }
+
+# JiraIssue columns shown to voters; changes to other columns (sync bookkeeping) don't bump the session version
+DISPLAYED_ISSUE_COLUMNS = ('issue_title', 'issue_description', 'acceptance_criteria', 'current_story_points')
+
+def apply_jira_issue_values(issue, values):
+    """Copy changed values onto a JiraIssue. Returns True if a displayed column changed."""
+    changed = False
+    for column, value in values.items():
+        if getattr(issue, column) != value:
+            setattr(issue, column, value)
+            changed = changed or column in DISPLAYED_ISSUE_COLUMNS
+    return changed
+
+def parse_bool(value, default=False):
+    """Parse a JSON boolean, also accepting 'true'/'false', 'yes'/'no', '1'/'0' and 1/0
+
+    Raises ValueError for anything else.
+    """
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        normalized = value.strip().lower()
+        if normalized in ('true', 'yes', '1'):
+            return True
+        if normalized in ('false', 'no', '0', ''):
+            return False
+    raise ValueError(f'Invalid boolean: {value!r}')
+
+def narrow_jql_to_recent(jql_query, minutes):
+    """Restrict a JQL query to issues updated in the last `minutes` minutes
+
+    Uses Jira's relative date syntax, which is evaluated on the Jira server
+    and so doesn't depend on the server's time zone.
+    """
+    match = re.search(r'\s+ORDER\s+BY\s+.*$', jql_query, re.IGNORECASE | re.DOTALL)
+    order_by = match.group(0) if match else ''
+    where = jql_query[:match.start()] if match else jql_query
+    if not where.strip():
+        return f"updated >= -{minutes}m{order_by}"
+    return f"({where.strip()}) AND updated >= -{minutes}m{order_by}"
+
+def parse_story_points(fields):
+    """Get the current story points value from Jira issue fields as a float (or None)"""
+    current_story_points = fields.get('customfield_12310243')
+    if current_story_points is not None:
+        try:
+            current_story_points = float(current_story_points)
+        except (ValueError, TypeError):
+            current_story_points = None
+    return current_story_points
+
 def get_fibonacci_sequence(max_value=100):
     """Generate Fibonacci sequence up to max_value"""
     fib = [1, 2]
@@ -83,7 +212,7 @@ def calculate_t_shirt_size_consensus(votes):
 
     return tied_sizes[0]  # Fallback, shouldn't reach here
 
-def update_jira_custom_field(jira_url, token, issue_key, field_value, custom_field_id="customfield_12310243", is_object_value=False, retries=2, delay=1):
+def update_jira_custom_field(jira_url, token, issue_key, field_value, custom_field_id="customfield_12310243", is_object_value=False, retries=None, delay=None):
     """Update Jira issue custom field with retries
 
     Args:
@@ -93,17 +222,17 @@ def update_jira_custom_field(jira_url, token, issue_key, field_value, custom_fie
         field_value: Value to set
         custom_field_id: Custom field ID (default: story points field)
         is_object_value: Whether the field_value should be wrapped in an object with 'value' key
-        retries: Number of retries on failure
-        delay: Delay between retries
+        retries: Number of retries on transient failure (default: the client's retry policy)
+        delay: Base delay for exponential backoff between retries (default: the client's retry policy)
     """
-    headers = {
-        'Authorization': f'Bearer {token}',
-        'Accept': 'application/json',
-        'Content-Type': 'application/json'
-    }
+    client = get_jira_client(jira_url, token)
+    update_path = f"rest/api/2/issue/{issue_key}"
 
-    jira_url = jira_url.rstrip('/')
-    update_url = f"{jira_url}/rest/api/2/issue/{issue_key}"
+    retry_policy = client.retry_policy
+    if retries is not None:
+        retry_policy = retry_policy.replace(max_retries=retries)
+    if delay is not None:
+        retry_policy = retry_policy.replace(base_delay=delay)
 
     # Handle different field value formats
     if is_object_value:
@@ -117,23 +246,236 @@ def update_jira_custom_field(jira_url, token, issue_key, field_value, custom_fie
         }
     }
 
-    last_exception = None
-    for attempt in range(retries + 1):
+    # Transient errors are retried by the client; anything left is raised here
+    response = client.put(update_path, json=payload, retry_policy=retry_policy)
+    response.raise_for_status()
+    return True
+
+class BulkEditUnsupported(Exception):
+    """Raised when a Jira instance does not offer the bulk edit API"""
+
+# Jira base URL -> whether its bulk edit API is available
+_bulk_edit_support = {}
+
+# Responses meaning the Jira instance has no bulk edit API at all
+BULK_EDIT_UNSUPPORTED_STATUSES = (404, 405, 501)
+
+def supports_bulk_edit(jira_url, token, sample_issue_key):
+    """Check (once per Jira instance) whether the bulk edit API is available"""
+    base_url = jira_url.rstrip('/')
+    if base_url not in _bulk_edit_support:
+        client = get_jira_client(jira_url, token)
         try:
-            response = requests.put(update_url, json=payload, headers=headers)
-            response.raise_for_status()
-            return True  # Success
-        except requests.exceptions.RequestException as e:
-            last_exception = e
-            if attempt < retries:
-                time.sleep(delay)
+            response = client.get('rest/api/3/bulk/issues/fields', params={'issueIdsOrKeys': sample_issue_key})
+        except requests.exceptions.RequestException:
+            return False  # Don't remember transient failures
+        if response.status_code == 200:
+            _bulk_edit_support[base_url] = True
+        elif response.status_code in BULK_EDIT_UNSUPPORTED_STATUSES:
+            _bulk_edit_support[base_url] = False
+        else:
+            return False  # Auth, rate limit or server errors say nothing about the API; ask again next time
+    return _bulk_edit_support[base_url]
+
+def bulk_update_jira_custom_field(jira_url, token, issue_keys, field_value, custom_field_id="customfield_12310243", is_object_value=False, timeout=JIRA_BULK_TIMEOUT, issue_ids=None):
+    """Set one custom field value on many issues with Jira's bulk edit API
+
+    Submits a bulk edit task and waits for it to finish. Returns a tuple
+    (failed, unconfirmed): failed maps issue keys to Jira's error message,
+    unconfirmed is True when Jira skipped issues or reported a failure that
+    can't be matched to one of issue_keys, in which case the caller should
+    verify them individually. Jira reports failures by issue ID; issue_ids
+    maps issue keys to their IDs so those can be translated back.
+    """
+    client = get_jira_client(jira_url, token)
+
+    # Handle different field value formats
+    if is_object_value:
+        edited_fields = {'singleSelectCustomFields': [{'fieldId': custom_field_id, 'option': {'optionValue': field_value}}]}
+    else:
+        edited_fields = {'numberCustomFields': [{'fieldId': custom_field_id, 'value': field_value}]}
+
+    payload = {
+        'selectedActions': [custom_field_id],
+        'selectedIssueIdsOrKeys': issue_keys,
+        'editedFieldsInput': edited_fields,
+        'sendBulkNotification': False
+    }
+
+    response = client.post('rest/api/3/bulk/issues/fields', json=payload)
+    if response.status_code in BULK_EDIT_UNSUPPORTED_STATUSES:
+        _bulk_edit_support[jira_url.rstrip('/')] = False
+        raise BulkEditUnsupported(f'Jira at {jira_url} does not support bulk edit')
+    response.raise_for_status()
+    task_id = response.json()['taskId']
+
+    # Wait for the bulk edit task to finish
+    deadline = time.monotonic() + timeout
+    delay = 0.5
+    while True:
+        response = client.get(f'rest/api/3/bulk/queue/{task_id}')
+        response.raise_for_status()
+        progress = response.json()
+
+        status = progress.get('status')
+        if status == 'COMPLETE':
+            break
+        if status in ('FAILED', 'CANCEL_REQUESTED', 'CANCELLED', 'DEAD'):
+            raise RuntimeError(f'Bulk edit task {task_id} ended with status {status}')
+        if time.monotonic() + delay > deadline:
+            raise TimeoutError(f'Bulk edit task {task_id} did not finish within {timeout} seconds')
+
+        time.sleep(delay)
+        delay = min(delay * 2, 5)
+
+    # Failures are reported by issue ID (or sometimes key); translate them to keys
+    keys_by_id = {str(issue_id): key for key, issue_id in (issue_ids or {}).items() if issue_id}
+    known_keys = set(issue_keys)
+    failed = {}
+    unmatched = False
+    for id_or_key, errors in (progress.get('failedAccessibleIssues') or {}).items():
+        key = keys_by_id.get(str(id_or_key), str(id_or_key))
+        if key not in known_keys:
+            unmatched = True
+            continue
+        failed[key] = '; '.join(errors) if isinstance(errors, list) else str(errors)
+
+    # Issues Jira couldn't access, or failures we couldn't match up, leave the outcome unknown
+    unconfirmed = bool(progress.get('invalidOrInaccessibleIssueCount')) or unmatched
+
+    return failed, unconfirmed
+
+def write_estimation(jira_url, token, update):
+    """Push one elected value to Jira and build its per-issue result entry"""
+    try:
+        success = update_jira_custom_field(
+            jira_url,
+            token,
+            update['issue_key'],
+            update['elected_value'],
+            custom_field_id=update['custom_field_id'],
+            is_object_value=update['is_object_value']
+        )
+
+        result = {
+            'issue_key': update['issue_key'],
+            'status': 'success' if success else 'failed'
+        }
+        result.update(update['details'])
+        return result
+    except Exception as e:
+        return {
+            'issue_key': update['issue_key'],
+            'status': 'error',
+            'error': f"Jira update failed after retries: {str(e)}"
+        }
+
+def write_estimation_group(jira_url, token, updates):
+    """Push one elected value to many issues with a single bulk edit
 
-    if last_exception:
-        raise last_exception
-    return False # Should not be reached
+    Falls back to per-issue updates if the bulk edit fails, and for any
+    issue whose outcome the bulk edit didn't confirm.
+    """
+    first = updates[0]
+    issue_keys = [update['issue_key'] for update in updates]
 
-def calculate_and_update_estimations(session):
-    """Calculate elected values for all issues and update Jira"""
+    try:
+        failed, unconfirmed = bulk_update_jira_custom_field(
+            jira_url,
+            token,
+            issue_keys,
+            first['elected_value'],
+            custom_field_id=first['custom_field_id'],
+            is_object_value=first['is_object_value'],
+            issue_ids={update['issue_key']: update.get('issue_id') for update in updates}
+        )
+    except Exception:
+        return [write_estimation(jira_url, token, update) for update in updates]
+
+    results = []
+    for update in updates:
+        if update['issue_key'] in failed:
+            results.append({
+                'issue_key': update['issue_key'],
+                'status': 'error',
+                'error': f"Jira bulk update failed: {failed[update['issue_key']]}"
+            })
+        elif unconfirmed:
+            results.append(write_estimation(jira_url, token, update))
+        else:
+            result = {
+                'issue_key': update['issue_key'],
+                'status': 'success'
+            }
+            result.update(update['details'])
+            results.append(result)
+    return results
+
+def write_estimations(jira_url, token, updates, on_result=None):
+    """Push elected values to Jira and return one result per update, in order
+
+    Issues sharing an elected value are written with one bulk edit where
+    the Jira instance supports it (JIRA_BULK_WRITE); everything else uses
+    per-issue PUTs. Requests run on a bounded worker pool
+    (JIRA_WRITE_CONCURRENCY) and are rate limited per host by the Jira
+    client. If given, on_result(result) is called as each result is ready.
+    """
+    if not updates:
+        return []
+
+    # Worker threads have no app context, so resolve configuration and the client here
+    config = current_app.config if has_app_context() else {}
+    concurrency = int(config.get('JIRA_WRITE_CONCURRENCY', JIRA_WRITE_CONCURRENCY))
+    bulk_mode = config.get('JIRA_BULK_WRITE', JIRA_BULK_WRITE)
+    get_jira_client(jira_url, token)
+
+    # Group issues that receive the same value in the same field
+    groups = OrderedDict()
+    for position, update in enumerate(updates):
+        group_key = (update['custom_field_id'], update['is_object_value'], update['elected_value'])
+        groups.setdefault(group_key, []).append(position)
+
+    use_bulk = (
+        bulk_mode != 'off'
+        and any(len(positions) >= JIRA_BULK_MIN_ISSUES for positions in groups.values())
+        and supports_bulk_edit(jira_url, token, updates[0]['issue_key'])
+    )
+
+    # Each task is a list of positions written together
+    tasks = []
+    for positions in groups.values():
+        if use_bulk and len(positions) >= JIRA_BULK_MIN_ISSUES:
+            tasks.extend(chunked(positions, JIRA_BULK_MAX_ISSUES))
+        else:
+            tasks.extend([position] for position in positions)
+
+    def run_task(positions):
+        if len(positions) == 1:
+            return [write_estimation(jira_url, token, updates[positions[0]])]
+        return write_estimation_group(jira_url, token, [updates[position] for position in positions])
+
+    results = [None] * len(updates)
+    concurrency = max(1, min(concurrency, len(tasks)))
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='jira-write') as executor:
+        futures = {executor.submit(run_task, positions): positions for positions in tasks}
+        for future in as_completed(futures):
+            for position, result in zip(futures[future], future.result()):
+                results[position] = result
+                if on_result:
+                    on_result(result)
+
+    return results
+
+def calculate_and_update_estimations(session, on_result=None):
+    """Calculate elected values for all issues and update Jira
+
+    Elected values are worked out first and then written to Jira in one
+    batch by write_estimations. Results keep the order of the session's
+    issues.
+
+    If given, on_result(result, total) is called from the calling thread
+    as each per-issue result becomes final.
+    """
     issues = JiraIssue.query.filter_by(session_id=session.session_id).all()
     votes = Vote.query.filter_by(session_id=session.session_id).all()
 
@@ -145,6 +487,7 @@ def calculate_and_update_estimations(session):
         votes_by_issue[vote.issue_key].append(vote)
 
     update_results = []
+    pending_updates = []  # (position in update_results, update)
     voting_mode = session.voting_mode or 'story_points'  # Default for backward compatibility
 
     for issue in issues:
@@ -181,30 +524,20 @@ def calculate_and_update_estimations(session):
                 average = sum(numeric_votes) / len(numeric_votes)
                 elected_value = find_closest_fibonacci(average)
 
-                # Update Jira with story points
-                try:
-                    success = update_jira_custom_field(
-                        session.jira_url,
-                        session.jira_token,
-                        issue.issue_key,
-                        elected_value,
-                        custom_field_id="customfield_12310243",
-                        is_object_value=False
-                    )
-
-                    update_results.append({
-                        'issue_key': issue.issue_key,
-                        'status': 'success' if success else 'failed',
+                # Queue Jira update with story points
+                pending_updates.append((len(update_results), {
+                    'issue_key': issue.issue_key,
+                    'issue_id': issue.jira_id,
+                    'elected_value': elected_value,
+                    'custom_field_id': "customfield_12310243",
+                    'is_object_value': False,
+                    'details': {
                         'average': round(average, 2),
                         'elected_value': elected_value,
                         'votes_count': len(numeric_votes)
-                    })
-                except Exception as e:
-                    update_results.append({
-                        'issue_key': issue.issue_key,
-                        'status': 'error',
-                        'error': f"Jira update failed after retries: {str(e)}"
-                    })
+                    }
+                }))
+                update_results.append(None)
 
             elif voting_mode == 't_shirt_sizes':
                 # Calculate T-shirt size consensus
@@ -219,29 +552,19 @@ def calculate_and_update_estimations(session):
                     })
                     continue
 
-                # Update Jira with T-shirt size
-                try:
-                    success = update_jira_custom_field(
-                        session.jira_url,
-                        session.jira_token,
-                        issue.issue_key,
-                        elected_value,
-                        custom_field_id="customfield_12320852",
-                        is_object_value=True
-                    )
-
-                    update_results.append({
-                        'issue_key': issue.issue_key,
-                        'status': 'success' if success else 'failed',
+                # Queue Jira update with T-shirt size
+                pending_updates.append((len(update_results), {
+                    'issue_key': issue.issue_key,
+                    'issue_id': issue.jira_id,
+                    'elected_value': elected_value,
+                    'custom_field_id': "customfield_12320852",
+                    'is_object_value': True,
+                    'details': {
                         'elected_value': elected_value,
                         'votes_count': len(size_votes)
-                    })
-                except Exception as e:
-                    update_results.append({
-                        'issue_key': issue.issue_key,
-                        'status': 'error',
-                        'error': f"Jira update failed after retries: {str(e)}"
-                    })
+                    }
+                }))
+                update_results.append(None)
 
         except Exception as e:
             update_results.append({
@@ -250,8 +573,47 @@ def calculate_and_update_estimations(session):
                 'error': str(e)
             })
 
+    if on_result:
+        for result in update_results:
+            if result is not None:
+                on_result(result, len(update_results))
+
+    if not pending_updates:
+        return update_results
+
+    positions = [position for position, update in pending_updates]
+    written = write_estimations(
+        session.jira_url,
+        session.jira_token,
+        [update for position, update in pending_updates],
+        on_result=(lambda result: on_result(result, len(update_results))) if on_result else None
+    )
+    for position, result in zip(positions, written):
+        update_results[position] = result
+
     return update_results
 
+def commit_issue_changes(voting_session, issues):
+    """Commit changed issues under one new session version and tell clients about them
+
+    Stamps the issues with a fresh version so delta polling and ETags see
+    the change, applies them to the snapshot cache and publishes an
+    issues_updated event. Returns the issues as dicts.
+    """
+    if not issues:
+        db.session.commit()
+        return []
+
+    version = voting_session.bump_version()
+    for issue in issues:
+        issue.version = version
+    db.session.commit()
+
+    issue_dicts = [issue.to_dict() for issue in issues]
+    session_cache.update_issues(voting_session.session_id, issue_dicts)
+    session_events.publish(voting_session.session_id, 'issues_updated', {'issues': issue_dicts})
+    return issue_dicts
+
 @jira_bp.route('/create-session', methods=['POST'])
 def create_session():
     try:
@@ -265,20 +627,7 @@ def create_session():
         test_connection = data.get('test_connection', False)  # New flag for testing
 
         # Check for authenticated user (session or API key)
-        user_id = session.get('user_id')
-        user = None
-
-        # Check session authentication first
-        if user_id:
-            user = User.query.get(user_id)
-        else:
-            # Check for API key authentication
-            api_key = request.headers.get('X-API-Key') or request.headers.get('Authorization', '').replace('Bearer ', '')
-            if api_key:
-                from src.models.api_key import ApiKey
-                api_key_obj = ApiKey.verify_key(api_key)
-                if api_key_obj and api_key_obj.has_scope('write'):
-                    user = api_key_obj.user
+        user = get_current_user()
 
         # Require either authenticated user or creator_name (not needed for test connections)
         if not user and not creator_name and not test_connection:
@@ -298,22 +647,22 @@ def create_session():
         if voting_mode not in ['story_points', 't_shirt_sizes']:
             return jsonify({'error': 'Invalid voting mode. Must be "story_points" or "t_shirt_sizes"'}), 400
 
-        # Test Jira connection
-        try:
-            issues = fetch_jira_issues(jira_url, jira_token, jira_query)
-            if not issues:
+        # Test Jira connection without downloading any issues
+        if test_connection:
+            try:
+                issues_count = count_jira_issues(jira_url, jira_token, jira_query)
+            except Exception as e:
+                return jsonify({'error': f'Failed to connect to Jira: {str(e)}'}), 400
+
+            if not issues_count:
                 return jsonify({'error': 'No issues found or invalid Jira configuration'}), 400
-        except Exception as e:
-            return jsonify({'error': f'Failed to connect to Jira: {str(e)}'}), 400
 
-        # If this is just a test connection, return success without creating session
-        if test_connection:
             return jsonify({
                 'message': 'Connection test successful',
-                'issues_count': len(issues)
+                'issues_count': issues_count
             }), 200
 
-        # Create session (only if not testing)
+        # Create session
         session_id = str(uuid.uuid4())
         voting_session = VotingSession(
             session_id=session_id,
@@ -327,33 +676,43 @@ def create_session():
 
         db.session.add(voting_session)
 
-        # Store issues
-        for issue in issues:
-            # Get current story points value
-            current_story_points = issue['fields'].get('customfield_12310243')
-            if current_story_points is not None:
-                try:
-                    current_story_points = float(current_story_points)
-                except (ValueError, TypeError):
-                    current_story_points = None
-
-            jira_issue = JiraIssue(
-                session_id=session_id,
-                issue_key=issue['key'],
-                issue_title=issue['fields']['summary'],
-                issue_description=issue['fields'].get('description', ''),
-                acceptance_criteria=issue['fields'].get('customfield_12315940', ''),
-                current_story_points=current_story_points,
-                issue_url=f"{jira_url}/browse/{issue['key']}"
-            )
-            db.session.add(jira_issue)
+        # Stream issues from Jira and store them in chunks, so that large
+        # backlogs are never held in memory all at once
+        voting_session.last_synced_at = datetime.utcnow()
+        issues_count = 0
+        seen_keys = set()
+        try:
+            for chunk in chunked(fetch_jira_issues(jira_url, jira_token, jira_query), JIRA_ISSUE_CHUNK_SIZE):
+                for issue in chunk:
+                    # Offset pagination may return the same issue twice if results shift between pages
+                    if issue['key'] in seen_keys:
+                        continue
+                    seen_keys.add(issue['key'])
+
+                    jira_issue = JiraIssue(
+                        session_id=session_id,
+                        issue_key=issue['key'],
+                        issue_url=f"{jira_url}/browse/{issue['key']}",
+                        **jira_issue_values(issue)
+                    )
+                    db.session.add(jira_issue)
+                    issues_count += 1
+
+                db.session.flush()
+        except requests.exceptions.RequestException as e:
+            db.session.rollback()
+            return jsonify({'error': f'Failed to connect to Jira: {str(e)}'}), 400
+
+        if not issues_count:
+            db.session.rollback()
+            return jsonify({'error': 'No issues found or invalid Jira configuration'}), 400
 
         db.session.commit()
 
         return jsonify({
             'session_id': session_id,
             'message': 'Session created successfully',
-            'issues_count': len(issues)
+            'issues_count': issues_count
         }), 201
 
     except Exception as e:
@@ -362,13 +721,48 @@ def create_session():
 
 @jira_bp.route('/session/<session_id>', methods=['GET'])
 def get_session(session_id):
+    """Get a session with its issues and votes
+
+    With ?since=<version>, only issues and votes changed after that version
+    are returned, plus the keys of issues removed since then (apply
+    removals first). Returns 304 if nothing changed.
+    """
     try:
+        since = request.args.get('since', type=int)
+
+        if session_cache.enabled:
+            return get_cached_session(session_id, since)
+
         voting_session = VotingSession.query.filter_by(session_id=session_id).first()
         if not voting_session:
             return jsonify({'error': 'Session not found'}), 404
 
-        issues = JiraIssue.query.filter_by(session_id=session_id).all()
-        votes = Vote.query.filter_by(session_id=session_id).all()
+        if since is not None and since == voting_session.version:
+            return '', 304
+
+        # Check if current user can manage session
+        user_id = get_current_user_id()
+        user_can_manage = False
+        if user_id and voting_session.creator_id:
+            user_can_manage = voting_session.creator_id == user_id
+
+        # Every change to the response bumps the version, so the ETag needs no issue or vote rows
+        etag = make_etag(session_id, voting_session.version, voting_session.last_synced_at, user_can_manage, since)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+
+        # A version ahead of ours can't be diffed against, so send everything
+        is_delta = since is not None and since < voting_session.version
+
+        issues_query = JiraIssue.query.filter_by(session_id=session_id)
+        votes_query = Vote.query.filter_by(session_id=session_id)
+        if is_delta:
+            issues_query = issues_query.filter(JiraIssue.version > since)
+            votes_query = votes_query.filter(Vote.version > since)
+
+        issues = issues_query.order_by(JiraIssue.id).all()
+        votes = votes_query.order_by(Vote.id).all()
 
         # Group votes by issue
         votes_by_issue = {}
@@ -377,24 +771,129 @@ def get_session(session_id):
                 votes_by_issue[vote.issue_key] = []
             votes_by_issue[vote.issue_key].append(vote.to_dict())
 
-        # Check if current user can manage session
-        user_id = session.get('user_id')
-        user_can_manage = False
-        if user_id and voting_session.creator_id:
-            user_can_manage = voting_session.creator_id == user_id
-
         session_dict = voting_session.to_dict()
         session_dict['user_can_manage'] = user_can_manage
 
-        return jsonify({
+        result = {
             'session': session_dict,
             'issues': [issue.to_dict() for issue in issues],
-            'votes': votes_by_issue
-        }), 200
+            'votes': votes_by_issue,
+            'version': voting_session.version,
+            'full': not is_delta
+        }
+
+        if is_delta:
+            result['since'] = since
+            result['removed_issues'] = [
+                removed_issue.issue_key
+                for removed_issue in RemovedIssue.query.filter(
+                    RemovedIssue.session_id == session_id,
+                    RemovedIssue.version > since
+                ).all()
+            ]
+
+        return add_etag(jsonify(result), etag), 200
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def get_cached_session(session_id, since):
+    """get_session served from the in-memory session snapshot cache"""
+    snapshot = session_cache.get(session_id)
+    if snapshot is None:
+        return jsonify({'error': 'Session not found'}), 404
+
+    if since is not None and since == snapshot.version:
+        return '', 304
+
+    # Check if current user can manage session
+    user_id = get_current_user_id()
+    user_can_manage = False
+    if user_id and snapshot.creator_id:
+        user_can_manage = snapshot.creator_id == user_id
+
+    etag = make_etag(session_id, snapshot.version, snapshot.last_synced_at, user_can_manage, since)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    # A version ahead of ours can't be diffed against, so send everything
+    is_delta = since is not None and since < snapshot.version
+    session_dict, issues, votes_by_issue, removed_issues, version = session_cache.render(
+        snapshot, since if is_delta else None
+    )
+    session_dict['user_can_manage'] = user_can_manage
+
+    result = {
+        'session': session_dict,
+        'issues': issues,
+        'votes': votes_by_issue,
+        'version': version,
+        'full': not is_delta
+    }
+
+    if is_delta:
+        result['since'] = since
+        result['removed_issues'] = removed_issues
+
+    # A write may have landed since the ETag was computed
+    etag = make_etag(session_id, version, session_dict['last_synced_at'], user_can_manage, since)
+    return add_etag(jsonify(result), etag), 200
+
+@jira_bp.route('/session/<session_id>/events', methods=['GET'])
+def session_event_stream(session_id):
+    """Stream live session changes as Server-Sent Events
+
+    Events: vote, issue_removed, issues_updated, session_refreshed,
+    session_closing, session_closed and session_deleted. A resync event
+    means the client fell behind and should reload the whole session.
+    """
+    try:
+        voting_session = VotingSession.query.filter_by(session_id=session_id).first()
+        if not voting_session:
+            return jsonify({'error': 'Session not found'}), 404
+
+        # Subscribe before responding so no event is missed while the stream starts
+        subscription = session_events.subscribe(session_id)
+        return Response(
+            session_events.stream(subscription),
+            mimetype='text/event-stream',
+            headers={
+                'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no'  # Stop nginx from buffering the stream
+            }
+        )
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# One vote per issue per voter, matching the partial unique indexes on vote:
+# by user_id for authenticated users and by voter_name for guests.
+# The ON CONFLICT syntax is shared by SQLite (3.35+) and PostgreSQL.
+UPSERT_VOTE_SQL = """
+    INSERT INTO vote (session_id, issue_key, user_id, voter_name, estimation, voted_at, version)
+    VALUES (:session_id, :issue_key, :user_id, :voter_name, :estimation, :voted_at, :version)
+    ON CONFLICT (session_id, issue_key, {conflict_column}) WHERE {conflict_where}
+    DO UPDATE SET estimation = excluded.estimation, version = excluded.version
+    RETURNING *
+"""
+UPSERT_USER_VOTE = text(UPSERT_VOTE_SQL.format(conflict_column='user_id', conflict_where='user_id IS NOT NULL'))
+UPSERT_GUEST_VOTE = text(UPSERT_VOTE_SQL.format(conflict_column='voter_name', conflict_where='user_id IS NULL'))
+
+def upsert_vote(session_id, issue_key, estimation, version, user_id=None, voter_name=None):
+    """Insert a vote, or update the voter's existing vote on the issue, in one statement"""
+    statement = select(Vote).from_statement(UPSERT_USER_VOTE if user_id else UPSERT_GUEST_VOTE)
+    parameters = {
+        'session_id': session_id,
+        'issue_key': issue_key,
+        'user_id': user_id,
+        'voter_name': voter_name,
+        'estimation': estimation,
+        'voted_at': datetime.utcnow(),
+        'version': version
+    }
+    return db.session.scalars(statement, parameters, execution_options={'populate_existing': True}).one()
+
 @jira_bp.route('/vote', methods=['POST'])
 def submit_vote():
     try:
@@ -406,10 +905,7 @@ def submit_vote():
         estimation = data.get('estimation')
 
         # Check for authenticated user
-        user_id = session.get('user_id')
-        user = None
-        if user_id:
-            user = User.query.get(user_id)
+        user = get_current_user()
 
         # Determine voter identification
         if user:
@@ -440,92 +936,57 @@ def submit_vote():
         if voting_session.is_closed:
             return jsonify({'error': 'Voting session is closed'}), 400
 
-        # Check if voter already voted for this issue
-        existing_vote = None
+        # Stamp the vote with a new session version (this also serializes concurrent votes on SQLite)
+        version = voting_session.bump_version()
+
+        # Cheap indexed probe: has this voter voted anywhere in the session before?
         if user:
-            # For authenticated users, check by user_id
-            existing_vote = Vote.query.filter_by(
-                session_id=session_id,
-                issue_key=issue_key,
-                user_id=user.id
-            ).first()
+            previous_votes = Vote.query.filter_by(session_id=session_id, user_id=user.id)
         else:
-            # For guest/non-authenticated users, check by voter_name (which includes email for guests)
-            existing_vote = Vote.query.filter_by(
-                session_id=session_id,
-                issue_key=issue_key,
-                voter_name=effective_voter_name,
-                user_id=None
-            ).first()
-
-        if existing_vote:
-            # Update existing vote
-            existing_vote.estimation = estimation
-        else:
-            # Create new vote
-            vote_data = {
-                'session_id': session_id,
-                'issue_key': issue_key,
-                'estimation': estimation
-            }
+            previous_votes = Vote.query.filter_by(session_id=session_id, voter_name=effective_voter_name, user_id=None)
+        is_first_vote = not db.session.query(previous_votes.exists()).scalar()
+
+        # Insert the vote, or change the voter's existing vote on this issue, in one statement
+        vote = upsert_vote(
+            session_id,
+            issue_key,
+            estimation,
+            version,
+            user_id=user.id if user else None,
+            voter_name=None if user else effective_voter_name
+        )
 
-            if user:
-                vote_data['user_id'] = user.id
-                vote_data['voter_name'] = None  # Clear voter_name for authenticated users
-            else:
-                vote_data['user_id'] = None
-                vote_data['voter_name'] = effective_voter_name
-
-            vote = Vote(**vote_data)
-            db.session.add(vote)
-
-            # Check if this is the voter's first vote in this session and send notification
-            is_first_vote = False
-            voter_id = user.id if user else None
-            voter_name_for_check = effective_voter_name
-
-            if voter_id:
-                # For authenticated users, check by user_id
-                previous_votes = Vote.query.filter_by(
-                    session_id=session_id,
-                    user_id=voter_id
-                ).count()
-                is_first_vote = previous_votes == 1  # Including the current vote we just added
-            else:
-                # For guest users, check by voter_name
-                previous_votes = Vote.query.filter_by(
-                    session_id=session_id,
-                    voter_name=voter_name_for_check,
-                    user_id=None
-                ).count()
-                is_first_vote = previous_votes == 1  # Including the current vote we just added
-
-            # Send first vote notification email to session creator (non-blocking)
-            if is_first_vote and voting_session.creator_id:
-                try:
-                    mail = current_app.extensions.get('mail')
-                    if mail:
-                        creator = User.query.get(voting_session.creator_id)
-                        if creator and creator.email:
-                            session_details = {
-                                'jira_url': voting_session.jira_url,
-                                'jira_query': voting_session.jira_query
-                            }
-                            send_first_vote_notification_email(
-                                mail,
-                                creator.email,
-                                creator.username,
-                                effective_voter_name,
-                                session_id,
-                                issue_key,
-                                estimation,
-                                session_details
-                            )
-                except Exception as email_error:
-                    current_app.logger.error(f"Failed to send first vote notification email: {str(email_error)}")
+        # Send first vote notification email to session creator (non-blocking)
+        if is_first_vote and voting_session.creator_id:
+            try:
+                mail = current_app.extensions.get('mail')
+                if mail:
+                    # Same object as `user` when the creator votes, so no extra lookup
+                    creator = db.session.get(User, voting_session.creator_id)
+                    if creator and creator.email:
+                        session_details = {
+                            'jira_url': voting_session.jira_url,
+                            'jira_query': voting_session.jira_query
+                        }
+                        send_first_vote_notification_email(
+                            mail,
+                            creator.email,
+                            creator.username,
+                            effective_voter_name,
+                            session_id,
+                            issue_key,
+                            estimation,
+                            session_details
+                        )
+            except Exception as email_error:
+                current_app.logger.error(f"Failed to send first vote notification email: {str(email_error)}")
 
         db.session.commit()
 
+        vote_dict = vote.to_dict()
+        session_cache.apply_vote(session_id, vote_dict)
+        session_events.publish(session_id, 'vote', {'vote': vote_dict})
+
         return jsonify({'message': 'Vote submitted successfully'}), 200
 
     except Exception as e:
@@ -534,13 +995,14 @@ def submit_vote():
 
 @jira_bp.route('/close-session', methods=['POST'])
 def close_session():
+    """Queue closing a session; the Jira write-back runs as a background job"""
     try:
         data = request.get_json()
         session_id = data.get('session_id')
         creator_name = data.get('creator_name')  # For backward compatibility
 
         # Check for authenticated user
-        user_id = session.get('user_id')
+        user_id = get_current_user_id()
 
         if not session_id:
             return jsonify({'error': 'Session ID is required'}), 400
@@ -559,60 +1021,228 @@ def close_session():
         if not can_close:
             return jsonify({'error': 'Only the session creator can close the session'}), 403
 
-        try:
-            update_results = calculate_and_update_estimations(voting_session)
-
-            # Check for failures
-            failed_updates = [r for r in update_results if r['status'] in ['failed', 'error']]
-            if failed_updates:
-                return jsonify({
-                    'error': 'Failed to update one or more Jira issues. Session remains open.',
-                    'details': failed_updates
-                }), 500
-
-            voting_session.is_closed = True
-            db.session.commit()
-
-            return jsonify({
-                'message': 'Session closed successfully',
-                'jira_updates': update_results
-            }), 200
+        if voting_session.is_closed:
+            return jsonify({'error': 'Session is already closed'}), 400
+
+        # Don't start a second write-back while one is still in progress
+        job = Job.query.filter(
+            Job.job_type == 'close_session',
+            Job.session_id == session_id,
+            Job.status.in_(['queued', 'running'])
+        ).first()
+        if not job:
+            try:
+                job = job_queue.enqueue('close_session', session_id=session_id)
+                session_events.publish(session_id, 'session_closing', {'job_id': job.id})
+            except DuplicateJob:
+                # A concurrent request queued it first
+                job = Job.query.filter(
+                    Job.job_type == 'close_session',
+                    Job.session_id == session_id,
+                    Job.status.in_(['queued', 'running'])
+                ).first()
+                if not job:
+                    return jsonify({'error': 'Session is already being closed'}), 409
 
-        except Exception as jira_error:
-            return jsonify({
-                'error': 'An unexpected error occurred during Jira update. Session remains open.',
-                'details': str(jira_error)
-            }), 500
+        return jsonify({
+            'message': 'Session close queued',
+            'job_id': job.id,
+            'status': job.status,
+            'status_url': f'/api/jobs/{job.id}'
+        }), 202
 
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
-def fetch_jira_issues(jira_url, token, jql_query):
-    """Fetch issues from Jira using JQL query"""
-    headers = {
-        'Authorization': f'Bearer {token}',
-        'Accept': 'application/json',
-        'Content-Type': 'application/json'
+@job_queue.handler('close_session')
+def run_close_session_job(job, report_progress):
+    """Push elected values to Jira and close the session if every update succeeded"""
+    voting_session = VotingSession.query.filter_by(session_id=job.session_id).first()
+    if not voting_session:
+        raise JobFailed('Session not found')
+
+    try:
+        update_results = calculate_and_update_estimations(voting_session, on_result=report_progress)
+    except Exception as jira_error:
+        raise JobFailed(f'An unexpected error occurred during Jira update. Session remains open. {str(jira_error)}')
+
+    # Check for failures
+    failed_updates = [r for r in update_results if r['status'] in ['failed', 'error']]
+    if failed_updates:
+        raise JobFailed(
+            'Failed to update one or more Jira issues. Session remains open.',
+            {'update_results': update_results, 'details': failed_updates}
+        )
+
+    voting_session.is_closed = True
+    voting_session.bump_version()
+    db.session.commit()
+
+    session_cache.invalidate(voting_session.session_id)
+    session_events.publish(voting_session.session_id, 'session_closed')
+
+    return {
+        'message': 'Session closed successfully',
+        'update_results': update_results
     }
 
-    # Clean up URL
-    jira_url = jira_url.rstrip('/')
+@jira_bp.route('/jira-rate-limits', methods=['GET'])
+def get_jira_rate_limits():
+    """Report how long Jira calls from this worker waited on the per-host rate limiter"""
+    user_id = get_current_user_id()
+    if not user_id:
+        return jsonify({'error': 'Not authenticated'}), 401
+
+    limiter = get_rate_limiter()
+    return jsonify({
+        'rate_per_second': limiter.rate,
+        'burst': limiter.burst,
+        'backend': type(limiter.backend).__name__,
+        'hosts': limiter.get_metrics()
+    }), 200
+
+@jira_bp.route('/session-cache-stats', methods=['GET'])
+def get_session_cache_stats():
+    """Report hit/miss counters and memory use of this worker's session snapshot cache"""
+    user_id = get_current_user_id()
+    if not user_id:
+        return jsonify({'error': 'Not authenticated'}), 401
+
+    return jsonify(session_cache.get_stats()), 200
+
+@jira_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Report the progress and result of a background job"""
+    try:
+        job = db.session.get(Job, job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+
+        # Only the creator of the job's session may follow it
+        if job.session_id:
+            user_id = get_current_user_id()
+            creator_name = request.args.get('creator_name')  # For backward compatibility
+            voting_session = VotingSession.query.filter_by(session_id=job.session_id).first()
+            if not voting_session:
+                # Nobody can prove they created a deleted session
+                return jsonify({'error': 'Job not found'}), 404
+            if not voting_session.can_be_managed_by_user(user_id=user_id, user_name=creator_name):
+                return jsonify({'error': 'Only the session creator can view this job'}), 403
+
+        return jsonify({'job': job.to_dict()}), 200
 
-    # Construct search URL
-    search_url = f"{jira_url}/rest/api/2/search"
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def search_jira_page(jira_url, token, jql_query, start_at, max_results, fields=JIRA_ISSUE_FIELDS, validate_query=None):
+    """Fetch a single page of JQL search results from Jira"""
+    client = get_jira_client(jira_url, token)
 
     params = {
         'jql': jql_query,
-        'maxResults': 50,
-        'fields': 'summary,description,status,assignee,priority,customfield_12315940,customfield_12310243'
+        'startAt': start_at,
+        'maxResults': max_results,
+        'fields': fields
     }
+    if validate_query:
+        params['validateQuery'] = validate_query
 
-    response = requests.get(search_url, headers=headers, params=params)
+    response = client.get('rest/api/2/search', params=params)
     response.raise_for_status()
 
-    data = response.json()
-    return data.get('issues', [])
+    return response.json()
+
+def fetch_jira_issues(jira_url, token, jql_query, page_size=JIRA_SEARCH_PAGE_SIZE, concurrency=None):
+    """Fetch issues from Jira using JQL query
+
+    Walks through every page of the search using startAt/total and yields
+    issues one at a time, so the full result set is never held in memory.
+    Once the first page reports the total, the remaining pages are requested
+    by up to `concurrency` parallel workers and yielded back in order.
+    """
+    if concurrency is None:
+        concurrency = JIRA_FETCH_CONCURRENCY
+        if has_app_context():
+            concurrency = current_app.config.get('JIRA_FETCH_CONCURRENCY', JIRA_FETCH_CONCURRENCY)
+    concurrency = max(1, int(concurrency))
+
+    first_page = search_jira_page(jira_url, token, jql_query, 0, page_size)
+    issues = first_page.get('issues', [])
+    for issue in issues:
+        yield issue
+
+    total = first_page.get('total', 0)
+    if not issues or len(issues) >= total:
+        return
+
+    # Jira may cap maxResults below what was requested, so page by what it actually returns
+    effective_page_size = min(first_page.get('maxResults') or len(issues), len(issues))
+
+    if concurrency == 1:
+        start_at = len(issues)
+        while start_at < total:
+            data = search_jira_page(jira_url, token, jql_query, start_at, effective_page_size)
+            page_issues = data.get('issues', [])
+            for issue in page_issues:
+                yield issue
+            if not page_issues:
+                break
+            start_at += len(page_issues)
+        return
+
+    # Keep at most `concurrency` pages in flight and hand them out in request order
+    offsets = iter(range(len(issues), total, effective_page_size))
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='jira-search') as executor:
+        pending = deque(
+            executor.submit(search_jira_page, jira_url, token, jql_query, start_at, effective_page_size)
+            for start_at in itertools.islice(offsets, concurrency)
+        )
+        while pending:
+            data = pending.popleft().result()
+            next_start_at = next(offsets, None)
+            if next_start_at is not None:
+                pending.append(executor.submit(search_jira_page, jira_url, token, jql_query, next_start_at, effective_page_size))
+            for issue in data.get('issues', []):
+                yield issue
+
+def count_jira_issues(jira_url, token, jql_query):
+    """Count issues matching a JQL query without fetching them"""
+    data = search_jira_page(jira_url, token, jql_query, 0, 0, fields='summary')
+    return data.get('total', 0)
+
+def fetch_jira_issues_by_key(jira_url, token, issue_keys, batch_size=JIRA_KEY_BATCH_SIZE, concurrency=None):
+    """Fetch specific issues with `key in (...)` searches and return them by key
+
+    Keys are split into batches of `batch_size`, one search per batch, run
+    by up to `concurrency` parallel workers. Keys Jira doesn't return
+    (deleted, moved or not visible) are simply absent from the result.
+    """
+    if concurrency is None:
+        concurrency = JIRA_FETCH_CONCURRENCY
+        if has_app_context():
+            concurrency = current_app.config.get('JIRA_FETCH_CONCURRENCY', JIRA_FETCH_CONCURRENCY)
+
+    batches = list(chunked(issue_keys, batch_size))
+    if not batches:
+        return {}
+
+    # Worker threads have no app context, so make sure the client exists first
+    get_jira_client(jira_url, token)
+
+    def search_batch(keys):
+        key_list = ', '.join(f'"{key}"' for key in keys)
+        # validateQuery=warn keeps Jira from rejecting the whole search over one unknown key
+        data = search_jira_page(jira_url, token, f'key in ({key_list})', 0, len(keys), validate_query='warn')
+        return data.get('issues', [])
+
+    issues = {}
+    concurrency = max(1, min(int(concurrency), len(batches)))
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='jira-search') as executor:
+        for batch_issues in executor.map(search_batch, batches):
+            for issue in batch_issues:
+                issues[issue['key']] = issue
+    return issues
 
 @jira_bp.route('/delete-session', methods=['DELETE'])
 def delete_session():
@@ -622,7 +1252,7 @@ def delete_session():
         creator_name = data.get('creator_name')  # For backward compatibility
 
         # Check for authenticated user
-        user_id = session.get('user_id')
+        user_id = get_current_user_id()
 
         if not session_id:
             return jsonify({'error': 'Session ID is required'}), 400
@@ -639,6 +1269,9 @@ def delete_session():
         # Delete the session
         voting_session.delete_session()
 
+        session_cache.invalidate(session_id)
+        session_events.publish(session_id, 'session_deleted')
+
         return jsonify({'message': 'Session deleted successfully'}), 200
 
     except Exception as e:
@@ -654,7 +1287,7 @@ def remove_issue():
         creator_name = data.get('creator_name')  # For backward compatibility
 
         # Check for authenticated user
-        user_id = session.get('user_id')
+        user_id = get_current_user_id()
 
         if not all([session_id, issue_key]):
             return jsonify({'error': 'Session ID and Issue Key are required'}), 400
@@ -678,7 +1311,10 @@ def remove_issue():
             return jsonify({'error': 'Issue not found in session'}), 404
 
         # Remove the issue
-        voting_session.remove_issue(issue_key)
+        version = voting_session.remove_issue(issue_key)
+
+        session_cache.remove_issue(session_id, issue_key, version)
+        session_events.publish(session_id, 'issue_removed', {'issue_key': issue_key})
 
         return jsonify({'message': 'Issue removed successfully'}), 200
 
@@ -696,7 +1332,7 @@ def push_story_points():
         creator_name = data.get('creator_name')  # For backward compatibility
 
         # Check for authenticated user
-        user_id = session.get('user_id')
+        user_id = get_current_user_id()
 
         if not all([session_id, issue_key]):
             return jsonify({'error': 'Session ID and Issue Key are required'}), 400
@@ -752,8 +1388,9 @@ def push_story_points():
 
                 if success:
                     # Update the current story points in our database
+                    changed = issue.current_story_points != elected_value
                     issue.current_story_points = elected_value
-                    db.session.commit()
+                    commit_issue_changes(voting_session, [issue] if changed else [])
 
                     return jsonify({
                         'message': 'Story points pushed successfully',
@@ -784,7 +1421,8 @@ def push_story_points():
                 )
 
                 if success:
-                    db.session.commit()
+                    # T-shirt sizes aren't stored on the issue, so nothing clients see has changed
+                    commit_issue_changes(voting_session, [])
 
                     return jsonify({
                         'message': 'T-shirt size estimate pushed successfully',
@@ -804,14 +1442,23 @@ def push_story_points():
 
 @jira_bp.route('/refresh-session', methods=['POST'])
 def refresh_session():
-    """Refresh entire session: re-run JQL query, update existing issues, add new ones"""
+    """Refresh entire session: re-run JQL query, update existing issues, add new ones
+
+    Once a session has been synced, only issues Jira reports as updated
+    since the last sync are fetched, and only rows whose fields actually
+    changed are written. Pass full=true to re-fetch every issue.
+    """
     try:
         data = request.get_json()
         session_id = data.get('session_id')
         creator_name = data.get('creator_name')  # For backward compatibility
+        try:
+            full_refresh = parse_bool(data.get('full'))
+        except ValueError:
+            return jsonify({'error': 'full must be true or false'}), 400
 
         # Check for authenticated user
-        user_id = session.get('user_id')
+        user_id = get_current_user_id()
 
         if not session_id:
             return jsonify({'error': 'Session ID is required'}), 400
@@ -829,59 +1476,97 @@ def refresh_session():
         if not can_manage:
             return jsonify({'error': 'Only the session creator can refresh the session'}), 403
 
-        # Fetch fresh issues from Jira
+        # Narrow the query to issues updated since the last sync when possible
+        sync_started_at = datetime.utcnow()
+        jql_query = voting_session.jira_query
+        incremental = bool(voting_session.last_synced_at) and not full_refresh
+        if incremental:
+            elapsed_seconds = (sync_started_at - voting_session.last_synced_at).total_seconds()
+            window_minutes = math.ceil(max(0, elapsed_seconds) / 60) + JIRA_SYNC_MARGIN_MINUTES
+            jql_query = narrow_jql_to_recent(jql_query, window_minutes)
+
+        added_keys = []
+        updated_keys = []
+        changed_issues = []
+        unchanged_count = 0
+        seen_keys = set()
+
+        # Stream fresh issues from Jira and apply them chunk by chunk
         try:
-            fresh_issues = fetch_jira_issues(voting_session.jira_url, voting_session.jira_token, voting_session.jira_query)
-        except Exception as e:
+            fresh_issues = fetch_jira_issues(voting_session.jira_url, voting_session.jira_token, jql_query)
+            for chunk in chunked(fresh_issues, JIRA_ISSUE_CHUNK_SIZE):
+                # Get existing issues in the session for this chunk only
+                chunk_keys = [fresh_issue['key'] for fresh_issue in chunk]
+                existing_issues = {
+                    issue.issue_key: issue
+                    for issue in JiraIssue.query.filter(
+                        JiraIssue.session_id == session_id,
+                        JiraIssue.issue_key.in_(chunk_keys)
+                    ).all()
+                }
+
+                # Process each fresh issue
+                for fresh_issue in chunk:
+                    issue_key = fresh_issue['key']
+                    if issue_key in seen_keys:
+                        continue
+                    seen_keys.add(issue_key)
+
+                    values = jira_issue_values(fresh_issue)
+
+                    if issue_key in existing_issues:
+                        # Update existing issue only if something changed (keep votes)
+                        if apply_jira_issue_values(existing_issues[issue_key], values):
+                            changed_issues.append(existing_issues[issue_key])
+                            updated_keys.append(issue_key)
+                        else:
+                            unchanged_count += 1
+                    else:
+                        # Add new issue
+                        new_issue = JiraIssue(
+                            session_id=session_id,
+                            issue_key=issue_key,
+                            issue_url=f"{voting_session.jira_url}/browse/{issue_key}",
+                            **values
+                        )
+                        db.session.add(new_issue)
+                        changed_issues.append(new_issue)
+                        added_keys.append(issue_key)
+
+                db.session.flush()
+        except requests.exceptions.RequestException as e:
+            db.session.rollback()
             return jsonify({'error': f'Failed to fetch issues from Jira: {str(e)}'}), 400
 
-        # Get existing issues in the session
-        existing_issues = {issue.issue_key: issue for issue in JiraIssue.query.filter_by(session_id=session_id).all()}
-
-        updated_count = 0
-        added_count = 0
-
-        # Process each fresh issue
-        for fresh_issue in fresh_issues:
-            issue_key = fresh_issue['key']
-
-            # Get current story points value
-            current_story_points = fresh_issue['fields'].get('customfield_12310243')
-            if current_story_points is not None:
-                try:
-                    current_story_points = float(current_story_points)
-                except (ValueError, TypeError):
-                    current_story_points = None
-
-            if issue_key in existing_issues:
-                # Update existing issue (keep votes)
-                existing_issue = existing_issues[issue_key]
-                existing_issue.issue_title = fresh_issue['fields']['summary']
-                existing_issue.issue_description = fresh_issue['fields'].get('description', '')
-                existing_issue.acceptance_criteria = fresh_issue['fields'].get('customfield_12315940', '')
-                existing_issue.current_story_points = current_story_points
-                updated_count += 1
-            else:
-                # Add new issue
-                new_issue = JiraIssue(
-                    session_id=session_id,
-                    issue_key=issue_key,
-                    issue_title=fresh_issue['fields']['summary'],
-                    issue_description=fresh_issue['fields'].get('description', ''),
-                    acceptance_criteria=fresh_issue['fields'].get('customfield_12315940', ''),
-                    current_story_points=current_story_points,
-                    issue_url=f"{voting_session.jira_url}/browse/{issue_key}"
-                )
-                db.session.add(new_issue)
-                added_count += 1
+        # Stamp everything this refresh changed with one new version
+        if changed_issues:
+            version = voting_session.bump_version()
+            for changed_issue in changed_issues:
+                changed_issue.version = version
 
+        voting_session.last_synced_at = sync_started_at
         db.session.commit()
 
+        # Too many changes to apply in place; the next read reloads the session
+        session_cache.invalidate(session_id)
+
+        if added_keys or updated_keys:
+            session_events.publish(session_id, 'session_refreshed', {
+                'added': added_keys,
+                'updated': updated_keys
+            })
+
         return jsonify({
             'message': 'Session refreshed successfully',
-            'updated_issues': updated_count,
-            'added_issues': added_count,
-            'total_issues': len(fresh_issues)
+            'mode': 'incremental' if incremental else 'full',
+            'updated_issues': len(updated_keys),
+            'added_issues': len(added_keys),
+            'unchanged_issues': unchanged_count,
+            'total_issues': len(seen_keys),
+            'changes': {
+                'added': added_keys,
+                'updated': updated_keys
+            }
         }), 200
 
     except Exception as e:
@@ -898,7 +1583,7 @@ def refresh_task():
         creator_name = data.get('creator_name')  # For backward compatibility
 
         # Check for authenticated user
-        user_id = session.get('user_id')
+        user_id = get_current_user_id()
 
         if not all([session_id, issue_key]):
             return jsonify({'error': 'Session ID and Issue Key are required'}), 400
@@ -923,20 +1608,13 @@ def refresh_task():
 
         # Fetch specific issue from Jira
         try:
-            headers = {
-                'Authorization': f'Bearer {voting_session.jira_token}',
-                'Accept': 'application/json',
-                'Content-Type': 'application/json'
-            }
-
-            jira_url = voting_session.jira_url.rstrip('/')
-            issue_url = f"{jira_url}/rest/api/2/issue/{issue_key}"
+            client = get_jira_client(voting_session.jira_url, voting_session.jira_token)
 
             params = {
-                'fields': 'summary,description,status,assignee,priority,customfield_12315940,customfield_12310243'
+                'fields': JIRA_ISSUE_FIELDS
             }
 
-            response = requests.get(issue_url, headers=headers, params=params)
+            response = client.get(f"rest/api/2/issue/{issue_key}", params=params)
             response.raise_for_status()
 
             fresh_issue = response.json()
@@ -944,21 +1622,10 @@ def refresh_task():
         except Exception as e:
             return jsonify({'error': f'Failed to fetch issue from Jira: {str(e)}'}), 400
 
-        # Get current story points value
-        current_story_points = fresh_issue['fields'].get('customfield_12310243')
-        if current_story_points is not None:
-            try:
-                current_story_points = float(current_story_points)
-            except (ValueError, TypeError):
-                current_story_points = None
-
-        # Update the issue (keep votes)
-        issue.issue_title = fresh_issue['fields']['summary']
-        issue.issue_description = fresh_issue['fields'].get('description', '')
-        issue.acceptance_criteria = fresh_issue['fields'].get('customfield_12315940', '')
-        issue.current_story_points = current_story_points
-
-        db.session.commit()
+        # Update the issue if anything changed (keep votes). Changes to sync
+        # bookkeeping alone are stored without notifying clients.
+        changed = apply_jira_issue_values(issue, jira_issue_values(fresh_issue))
+        commit_issue_changes(voting_session, [issue] if changed else [])
 
         return jsonify({
             'message': 'Task refreshed successfully',
@@ -970,3 +1637,96 @@ def refresh_task():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@jira_bp.route('/refresh-tasks', methods=['POST'])
+def refresh_tasks():
+    """Refresh several tasks at once: update their fields from Jira while keeping votes
+
+    Issues are fetched with batched `key in (...)` searches instead of one
+    request per issue, and all updates are committed in one transaction.
+    """
+    try:
+        data = request.get_json()
+        session_id = data.get('session_id')
+        issue_keys = data.get('issue_keys')
+        creator_name = data.get('creator_name')  # For backward compatibility
+
+        # Check for authenticated user
+        user_id = get_current_user_id()
+
+        if not session_id or not issue_keys:
+            return jsonify({'error': 'Session ID and Issue Keys are required'}), 400
+
+        if not isinstance(issue_keys, list):
+            return jsonify({'error': 'Issue Keys must be a list'}), 400
+
+        if not all(isinstance(issue_key, str) and issue_key.strip() for issue_key in issue_keys):
+            return jsonify({'error': 'Issue Keys must be non-empty strings'}), 400
+        issue_keys = [issue_key.strip() for issue_key in issue_keys]
+
+        # Drop duplicates while keeping the requested order
+        issue_keys = list(OrderedDict.fromkeys(issue_keys))
+        if len(issue_keys) > MAX_REFRESH_TASKS:
+            return jsonify({'error': f'At most {MAX_REFRESH_TASKS} issues can be refreshed at once'}), 400
+
+        voting_session = VotingSession.query.filter_by(session_id=session_id).first()
+        if not voting_session:
+            return jsonify({'error': 'Session not found'}), 404
+
+        # Check if session is closed
+        if voting_session.is_closed:
+            return jsonify({'error': 'Cannot refresh tasks in a closed session'}), 400
+
+        # Check if user can manage the session
+        can_manage = voting_session.can_be_managed_by_user(user_id=user_id, user_name=creator_name)
+        if not can_manage:
+            return jsonify({'error': 'Only the session creator can refresh tasks'}), 403
+
+        # Only issues already in the session are refreshed
+        issues = {}
+        for chunk_keys in chunked(issue_keys, JIRA_ISSUE_CHUNK_SIZE):
+            for issue in JiraIssue.query.filter(
+                JiraIssue.session_id == session_id,
+                JiraIssue.issue_key.in_(chunk_keys)
+            ).all():
+                issues[issue.issue_key] = issue
+
+        not_in_session = [issue_key for issue_key in issue_keys if issue_key not in issues]
+        session_keys = [issue_key for issue_key in issue_keys if issue_key in issues]
+
+        # Fetch the issues from Jira
+        try:
+            fresh_issues = fetch_jira_issues_by_key(voting_session.jira_url, voting_session.jira_token, session_keys)
+        except Exception as e:
+            return jsonify({'error': f'Failed to fetch issues from Jira: {str(e)}'}), 400
+
+        # Update issues that changed (keep votes), then commit everything at once
+        updated_keys = []
+        unchanged_keys = []
+        not_in_jira = []
+        for issue_key in session_keys:
+            fresh_issue = fresh_issues.get(issue_key)
+            if fresh_issue is None:
+                not_in_jira.append(issue_key)
+            elif apply_jira_issue_values(issues[issue_key], jira_issue_values(fresh_issue)):
+                updated_keys.append(issue_key)
+            else:
+                unchanged_keys.append(issue_key)
+
+        commit_issue_changes(voting_session, [issues[issue_key] for issue_key in updated_keys])
+
+        return jsonify({
+            'message': 'Tasks refreshed successfully',
+            'updated_issues': len(updated_keys),
+            'unchanged_issues': len(unchanged_keys),
+            'changes': {
+                'updated': updated_keys,
+                'unchanged': unchanged_keys,
+                'not_in_session': not_in_session,
+                'not_in_jira': not_in_jira
+            },
+            'issues': [issues[issue_key].to_dict() for issue_key in session_keys if issue_key in fresh_issues]
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
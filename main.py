@@ -10,9 +10,12 @@ from flask_mail import Mail
 # Import database and models
 from src.models.user import db, User
 from src.models.session_invitation import SessionInvitation
-from src.models.voting_session import VotingSession, JiraIssue, Vote
+from src.models.voting_session import VotingSession, JiraIssue, Vote, RemovedIssue
 from src.models.team import Team, TeamMembership
 from src.models.api_key import ApiKey, ApiKeyUsage
+from src.models.job import Job
+from src.models.outbound_email import OutboundEmail
+from src.models.migrations import upgrade_schema
 
 # Import routes
 from src.routes.user import user_bp
@@ -20,6 +23,13 @@ from jira import jira_bp  # Import from root level jira.py
 from src.routes.auth import auth_bp
 from src.routes.teams import teams_bp
 from src.routes.api_keys import api_keys_bp
+from src.services.job_queue import job_queue
+from src.services.session_events import session_events
+from src.services.session_cache import session_cache
+from src.services.mail_queue import mail_queue
+from src.services.api_key_cache import api_key_cache
+from src.services.api_usage_log import api_usage_log
+from src.services import auth_resolver
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
@@ -58,17 +68,78 @@ if mail_sender:
 else:
     print("⚠️  No email sender configured - emails will not be sent")
 
+# Outbound mail queue; set MAIL_QUEUE_WORKERS=0 to send emails during the request instead
+app.config['MAIL_QUEUE_WORKERS'] = int(os.getenv('MAIL_QUEUE_WORKERS', 1))
+app.config['MAIL_MAX_ATTEMPTS'] = int(os.getenv('MAIL_MAX_ATTEMPTS', 5))
+app.config['MAIL_RETRY_BASE_DELAY'] = float(os.getenv('MAIL_RETRY_BASE_DELAY', 30))
+app.config['MAIL_RETRY_MAX_DELAY'] = float(os.getenv('MAIL_RETRY_MAX_DELAY', 3600))
+app.config['MAIL_BATCH_SIZE'] = int(os.getenv('MAIL_BATCH_SIZE', 50))
+
 app.config['APP_BASE_URL'] = os.getenv('APP_BASE_URL', 'http://localhost:8080')
 
+# Jira integration configuration
+app.config['JIRA_FETCH_CONCURRENCY'] = int(os.getenv('JIRA_FETCH_CONCURRENCY', 4))
+app.config['JIRA_POOL_SIZE'] = int(os.getenv('JIRA_POOL_SIZE', 10))
+app.config['JIRA_CONNECT_TIMEOUT'] = float(os.getenv('JIRA_CONNECT_TIMEOUT', 5))
+app.config['JIRA_READ_TIMEOUT'] = float(os.getenv('JIRA_READ_TIMEOUT', 30))
+app.config['JIRA_MAX_RETRIES'] = int(os.getenv('JIRA_MAX_RETRIES', 3))
+app.config['JIRA_RETRY_BASE_DELAY'] = float(os.getenv('JIRA_RETRY_BASE_DELAY', 0.5))
+app.config['JIRA_RETRY_MAX_DELAY'] = float(os.getenv('JIRA_RETRY_MAX_DELAY', 30))
+app.config['JIRA_RETRY_DEADLINE'] = float(os.getenv('JIRA_RETRY_DEADLINE', 60))
+app.config['JIRA_WRITE_CONCURRENCY'] = int(os.getenv('JIRA_WRITE_CONCURRENCY', 4))
+app.config['JIRA_BULK_WRITE'] = os.getenv('JIRA_BULK_WRITE', 'auto')
+app.config['JIRA_RATE_LIMIT'] = float(os.getenv('JIRA_RATE_LIMIT', 10))
+app.config['JIRA_RATE_BURST'] = int(os.getenv('JIRA_RATE_BURST', 10))
+# 'memory' limits each process separately; 'sqlite' shares one budget between all worker processes
+app.config['JIRA_RATE_LIMIT_BACKEND'] = os.getenv('JIRA_RATE_LIMIT_BACKEND', 'memory')
+app.config['JIRA_RATE_LIMIT_DB'] = os.getenv('JIRA_RATE_LIMIT_DB', os.path.join(os.path.dirname(__file__), 'database', 'rate_limits.db'))
+
+# Background job configuration
+app.config['JOB_WORKERS'] = int(os.getenv('JOB_WORKERS', 2))
+
+# Live session updates (Server-Sent Events)
+app.config['SESSION_EVENTS_BACKEND'] = os.getenv('SESSION_EVENTS_BACKEND', 'memory')
+app.config['SESSION_EVENTS_HEARTBEAT'] = float(os.getenv('SESSION_EVENTS_HEARTBEAT', 15))
+
+# In-memory session snapshot cache, revalidated against the database on every read; 0 disables it
+app.config['SESSION_CACHE_MAX_BYTES'] = int(os.getenv('SESSION_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+# API key verification cache and batched last_used_at writes
+app.config['API_KEY_CACHE_TTL'] = float(os.getenv('API_KEY_CACHE_TTL', 60))
+app.config['API_KEY_USAGE_FLUSH_INTERVAL'] = float(os.getenv('API_KEY_USAGE_FLUSH_INTERVAL', 5))
+
+# Buffered API key usage logging
+app.config['API_USAGE_BUFFER_SIZE'] = int(os.getenv('API_USAGE_BUFFER_SIZE', 10000))
+app.config['API_USAGE_FLUSH_SIZE'] = int(os.getenv('API_USAGE_FLUSH_SIZE', 500))
+app.config['API_USAGE_FLUSH_INTERVAL'] = float(os.getenv('API_USAGE_FLUSH_INTERVAL', 2))
+app.config['API_USAGE_RETENTION_DAYS'] = int(os.getenv('API_USAGE_RETENTION_DAYS', 30))
+app.config['API_USAGE_HOURLY_ROLLUP_RETENTION_DAYS'] = int(os.getenv('API_USAGE_HOURLY_ROLLUP_RETENTION_DAYS', 90))
+app.config['API_USAGE_PRUNE_BATCH_SIZE'] = int(os.getenv('API_USAGE_PRUNE_BATCH_SIZE', 1000))
+
 # Initialize database with app
 db.init_app(app)
 
 # Initialize Flask-Mail
 mail = Mail(app)
 
-# Create all tables within app context
+# Create missing tables and columns within app context
 with app.app_context():
-    db.create_all()
+    upgrade_schema()
+
+# Set up the pub/sub used for live session updates
+session_events.init_app(app)
+session_cache.init_app(app)
+api_key_cache.init_app(app)
+api_usage_log.init_app(app)
+
+# Accept API keys on the session, team and account endpoints
+auth_resolver.init_app(app)
+
+# Start the background email senders (delivers emails left queued by a previous run)
+mail_queue.init_app(app)
+
+# Start background job workers (resumes jobs left queued by a previous run)
+job_queue.init_app(app)
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
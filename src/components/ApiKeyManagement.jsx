@@ -331,7 +331,7 @@ const ApiKeyManagement = ({ user }) => {
                     <Badge variant="outline" className="text-xs">POST</Badge>
                     <code>/api/close-session</code>
                   </div>
-                  <p className="text-muted-foreground text-xs">Close session and update Jira with final estimations</p>
+                  <p className="text-muted-foreground text-xs">Close session and update Jira with final estimations in the background (poll <code>/api/jobs/&lt;job_id&gt;</code> for progress)</p>
                 </div>
               </div>
             </div>
@@ -35,23 +35,43 @@ const UserDashboard = ({ user, onLogout, onJoinSession, onCreateSession, onJoinB
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState('')
 
+  // Pagination and filters for the session lists
+  const [nextCursors, setNextCursors] = useState({})
+  const [loadingMore, setLoadingMore] = useState({})
+  const [filters, setFilters] = useState({ status: '', voting_mode: '' })
+
   // Share link functionality
   const [copiedLinks, setCopiedLinks] = useState({}) // Track copied state per session
 
   useEffect(() => {
     fetchUserSessions()
-  }, [])
+  }, [filters])
+
+  const buildSessionsQuery = (extra = {}) => {
+    const params = new URLSearchParams()
+    for (const [name, value] of Object.entries({ ...filters, ...extra })) {
+      if (value) {
+        params.set(name, value)
+      }
+    }
+    return params.toString()
+  }
 
   const fetchUserSessions = async () => {
     try {
-      const response = await fetch('/api/auth/user-sessions', {
+      const response = await fetch(`/api/auth/user-sessions?${buildSessionsQuery()}`, {
         credentials: 'include'
       })
 
       const data = await response.json()
 
       if (response.ok) {
-        setSessions(data)
+        setSessions({
+          owned_sessions: data.owned_sessions,
+          invited_sessions: data.invited_sessions,
+          participated_sessions: data.participated_sessions
+        })
+        setNextCursors(data.next_cursors || {})
         setError('')
       } else {
         setError(data.error || 'Failed to fetch sessions')
@@ -63,6 +83,44 @@ const UserDashboard = ({ user, onLogout, onJoinSession, onCreateSession, onJoinB
     }
   }
 
+  const loadMoreSessions = async (list) => {
+    setLoadingMore(prev => ({ ...prev, [list]: true }))
+    try {
+      const response = await fetch(`/api/auth/user-sessions?${buildSessionsQuery({ list, cursor: nextCursors[list] })}`, {
+        credentials: 'include'
+      })
+
+      const data = await response.json()
+
+      if (response.ok) {
+        const key = `${list}_sessions`
+        setSessions(prev => ({ ...prev, [key]: [...prev[key], ...data[key]] }))
+        setNextCursors(prev => ({ ...prev, [list]: data.next_cursors[list] }))
+      } else {
+        setError(data.error || 'Failed to fetch sessions')
+      }
+    } catch (err) {
+      setError('Network error: ' + err.message)
+    } finally {
+      setLoadingMore(prev => ({ ...prev, [list]: false }))
+    }
+  }
+
+  const LoadMoreButton = ({ list }) => {
+    if (!nextCursors[list]) {
+      return null
+    }
+    return (
+      <div className="flex justify-center">
+        <Button variant="outline" onClick={() => loadMoreSessions(list)} disabled={loadingMore[list]}>
+          {loadingMore[list] ? 'Loading...' : 'Load more'}
+        </Button>
+      </div>
+    )
+  }
+
+  const selectClassName = "flex h-10 rounded-md border border-input bg-background px-3 py-2 text-sm ring-offset-background focus-visible:outline-none focus-visible:ring-2 focus-visible:ring-ring focus-visible:ring-offset-2"
+
   const deleteSession = async (sessionId) => {
     if (!confirm('Are you sure you want to delete this session? This action cannot be undone and will remove all votes and data.')) {
       return
@@ -384,12 +442,34 @@ const UserDashboard = ({ user, onLogout, onJoinSession, onCreateSession, onJoinB
             </Card>
           </div>
 
+      {/* Session filters */}
+      <div className="flex flex-wrap items-center gap-2">
+        <select
+          value={filters.status}
+          onChange={(e) => setFilters(prev => ({ ...prev, status: e.target.value }))}
+          className={selectClassName}
+        >
+          <option value="">All statuses</option>
+          <option value="open">Open</option>
+          <option value="closed">Closed</option>
+        </select>
+        <select
+          value={filters.voting_mode}
+          onChange={(e) => setFilters(prev => ({ ...prev, voting_mode: e.target.value }))}
+          className={selectClassName}
+        >
+          <option value="">All voting modes</option>
+          <option value="story_points">Story Points</option>
+          <option value="t_shirt_sizes">T-Shirt Sizes</option>
+        </select>
+      </div>
+
       {/* Owned Sessions */}
       <div className="space-y-4">
         <div className="flex items-center gap-2">
           <Crown className="w-5 h-5 text-yellow-600" />
           <h2 className="text-2xl font-semibold">Your Sessions</h2>
-          <Badge variant="secondary">{sessions.owned_sessions.length}</Badge>
+          <Badge variant="secondary">{sessions.owned_sessions.length}{nextCursors.owned ? '+' : ''}</Badge>
         </div>
 
         {sessions.owned_sessions.length === 0 ? (
@@ -403,6 +483,7 @@ const UserDashboard = ({ user, onLogout, onJoinSession, onCreateSession, onJoinB
             {sessions.owned_sessions.map(session => (
               <SessionCard key={session.id} session={session} type="owned" />
             ))}
+            <LoadMoreButton list="owned" />
           </div>
         )}
       </div>
@@ -414,7 +495,7 @@ const UserDashboard = ({ user, onLogout, onJoinSession, onCreateSession, onJoinB
         <div className="flex items-center gap-2">
           <Mail className="w-5 h-5 text-blue-600" />
           <h2 className="text-2xl font-semibold">Invited Sessions</h2>
-          <Badge variant="secondary">{sessions.invited_sessions.length}</Badge>
+          <Badge variant="secondary">{sessions.invited_sessions.length}{nextCursors.invited ? '+' : ''}</Badge>
         </div>
 
         {sessions.invited_sessions.length === 0 ? (
@@ -428,6 +509,7 @@ const UserDashboard = ({ user, onLogout, onJoinSession, onCreateSession, onJoinB
             {sessions.invited_sessions.map(session => (
               <SessionCard key={session.id} session={session} type="invited" showJoinButton={true} />
             ))}
+            <LoadMoreButton list="invited" />
           </div>
         )}
       </div>
@@ -439,7 +521,7 @@ const UserDashboard = ({ user, onLogout, onJoinSession, onCreateSession, onJoinB
         <div className="flex items-center gap-2">
           <History className="w-5 h-5 text-gray-600" />
           <h2 className="text-2xl font-semibold">Participated Sessions</h2>
-          <Badge variant="secondary">{sessions.participated_sessions.length}</Badge>
+          <Badge variant="secondary">{sessions.participated_sessions.length}{nextCursors.participated ? '+' : ''}</Badge>
         </div>
 
         {sessions.participated_sessions.length === 0 ? (
@@ -453,6 +535,7 @@ const UserDashboard = ({ user, onLogout, onJoinSession, onCreateSession, onJoinB
             {sessions.participated_sessions.map(session => (
               <SessionCard key={session.id} session={session} type="participated" />
             ))}
+            <LoadMoreButton list="participated" />
           </div>
         )}
       </div>
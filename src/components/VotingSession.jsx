@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
 import { Button } from '@/components/ui/button.jsx'
 import { Input } from '@/components/ui/input.jsx'
 import { Label } from '@/components/ui/label.jsx'
@@ -34,6 +34,10 @@ const VotingSession = ({ sessionId, isCreator, creatorName, currentUser, guestUs
   const [refreshingSession, setRefreshingSession] = useState(false)
   const [refreshingTask, setRefreshingTask] = useState({})
   const [pushingStoryPoints, setPushingStoryPoints] = useState({})
+  const [closeProgress, setCloseProgress] = useState(null)
+
+  // Session version of the data we hold, so polls only fetch what changed
+  const versionRef = useRef(null)
 
   // Determine effective voter name and type
   const getVoterInfo = () => {
@@ -67,10 +71,50 @@ const VotingSession = ({ sessionId, isCreator, creatorName, currentUser, guestUs
     if (currentUser) {
       fetchUserTeams()
     }
-    const interval = setInterval(fetchSession, 5000) // Poll every 5 seconds
-    return () => clearInterval(interval)
+
+    // Live updates are pushed by the server; polling is only a fallback
+    let events = null
+    if (window.EventSource) {
+      events = new EventSource(`/api/session/${sessionId}/events`, { withCredentials: true })
+      // Reload on (re)connect to pick up anything missed while disconnected
+      events.onopen = () => fetchSession()
+      events.addEventListener('vote', (e) => applyVote(JSON.parse(e.data).vote))
+      events.addEventListener('issue_removed', (e) => applyIssueRemoved(JSON.parse(e.data).issue_key))
+      events.addEventListener('issues_updated', (e) => applyIssuesUpdated(JSON.parse(e.data).issues))
+      events.addEventListener('session_refreshed', () => fetchSession())
+      events.addEventListener('session_closed', () => fetchSession())
+      events.addEventListener('session_deleted', () => setError('This session has been deleted'))
+      events.addEventListener('resync', () => fetchSession())
+    }
+    const interval = setInterval(pollSession, events ? 60000 : 5000)
+    return () => {
+      clearInterval(interval)
+      if (events) {
+        events.close()
+      }
+    }
   }, [sessionId])
 
+  const applyVote = (vote) => {
+    setVotes(prev => {
+      const issueVotes = (prev[vote.issue_key] || []).filter(v => v.id !== vote.id)
+      return { ...prev, [vote.issue_key]: [...issueVotes, vote] }
+    })
+  }
+
+  const applyIssueRemoved = (issueKey) => {
+    setIssues(prev => prev.filter(issue => issue.issue_key !== issueKey))
+    setVotes(prev => {
+      const { [issueKey]: _removed, ...rest } = prev
+      return rest
+    })
+  }
+
+  const applyIssuesUpdated = (updatedIssues) => {
+    const byKey = Object.fromEntries(updatedIssues.map(issue => [issue.issue_key, issue]))
+    setIssues(prev => prev.map(issue => byKey[issue.issue_key] || issue))
+  }
+
   const fetchUserTeams = async () => {
     if (!currentUser) return
 
@@ -101,6 +145,7 @@ const VotingSession = ({ sessionId, isCreator, creatorName, currentUser, guestUs
         setSession(data.session)
         setIssues(data.issues)
         setVotes(data.votes)
+        versionRef.current = data.version
         setError('')
       } else {
         setError(data.error || 'Failed to fetch session')
@@ -112,6 +157,55 @@ const VotingSession = ({ sessionId, isCreator, creatorName, currentUser, guestUs
     }
   }
 
+  // Fetch only the changes since the version we hold
+  const pollSession = async () => {
+    if (versionRef.current === null) {
+      return fetchSession()
+    }
+
+    try {
+      const response = await fetch(`/api/session/${sessionId}?since=${versionRef.current}`, {
+        credentials: 'include'
+      })
+      if (response.status === 304) {
+        return
+      }
+      const data = await response.json()
+
+      if (!response.ok) {
+        setError(data.error || 'Failed to fetch session')
+        return
+      }
+
+      setSession(data.session)
+      if (data.full) {
+        setIssues(data.issues)
+        setVotes(data.votes)
+      } else {
+        // Removals first, since a removed issue may have been added back later
+        const removed = new Set(data.removed_issues)
+        const changedIssues = Object.fromEntries(data.issues.map(issue => [issue.issue_key, issue]))
+        setIssues(prev => {
+          const kept = prev.filter(issue => !removed.has(issue.issue_key)).map(issue => changedIssues[issue.issue_key] || issue)
+          const keptKeys = new Set(kept.map(issue => issue.issue_key))
+          return [...kept, ...data.issues.filter(issue => !keptKeys.has(issue.issue_key))]
+        })
+        setVotes(prev => {
+          const next = Object.fromEntries(Object.entries(prev).filter(([issueKey]) => !removed.has(issueKey)))
+          for (const [issueKey, changedVotes] of Object.entries(data.votes)) {
+            const changedIds = new Set(changedVotes.map(vote => vote.id))
+            next[issueKey] = [...(next[issueKey] || []).filter(vote => !changedIds.has(vote.id)), ...changedVotes]
+          }
+          return next
+        })
+      }
+      versionRef.current = data.version
+      setError('')
+    } catch (err) {
+      setError('Network error: ' + err.message)
+    }
+  }
+
   const submitVote = async (issueKey, estimation) => {
     if (!voterInfo) {
       alert('Please provide your identification to vote')
@@ -185,12 +279,47 @@ const VotingSession = ({ sessionId, isCreator, creatorName, currentUser, guestUs
       const data = await response.json()
 
       if (response.ok) {
+        // Jira write-back runs as a background job; follow its progress
+        await waitForCloseJob(data.job_id)
         fetchSession() // Refresh data
       } else {
         alert(data.error || 'Failed to close session')
       }
     } catch (err) {
       alert('Network error: ' + err.message)
+    } finally {
+      setCloseProgress(null)
+    }
+  }
+
+  const waitForCloseJob = async (jobId) => {
+    const params = !currentUser && voterInfo ? `?creator_name=${encodeURIComponent(voterInfo.name)}` : ''
+    setCloseProgress({ completed: 0, total: issues.length })
+
+    while (true) {
+      const response = await fetch(`/api/jobs/${jobId}${params}`, {
+        credentials: 'include'
+      })
+      const data = await response.json()
+
+      if (!response.ok) {
+        alert(data.error || 'Failed to check close progress')
+        return
+      }
+
+      const job = data.job
+      setCloseProgress({ completed: job.progress.completed, total: job.progress.total || issues.length })
+
+      if (job.status === 'succeeded') {
+        return
+      }
+      if (job.status === 'failed') {
+        const failedCount = job.result && job.result.details ? job.result.details.length : 0
+        alert(`${job.error || 'Failed to close session'}${failedCount ? ` (${failedCount} issues failed)` : ''}`)
+        return
+      }
+
+      await new Promise(resolve => setTimeout(resolve, 1000))
     }
   }
 
@@ -327,7 +456,11 @@ const VotingSession = ({ sessionId, isCreator, creatorName, currentUser, guestUs
       const data = await response.json()
 
       if (response.ok) {
-        alert(`Team "${data.team_name}" invited successfully! ${data.invited_count} members invited, ${data.already_invited_count} already invited.`)
+        const emailFailures = data.email_failures || []
+        const emailNote = emailFailures.length > 0
+          ? `\n\nInvitation emails could not be sent to: ${emailFailures.map((failure) => failure.email).join(', ')}`
+          : ''
+        alert(`Team "${data.team_name}" invited successfully! ${data.invited_count} members invited, ${data.already_invited_count} already invited.${emailNote}`)
         setSelectedTeam('')
       } else {
         alert(data.error || 'Failed to invite team')
@@ -470,7 +603,7 @@ const VotingSession = ({ sessionId, isCreator, creatorName, currentUser, guestUs
       if (response.ok) {
         // Refresh the session data
         await fetchSession()
-        alert(`Session refreshed successfully! Updated ${data.updated_issues} issues, added ${data.added_issues} new issues.`)
+        alert(`Session refreshed successfully! Updated ${data.updated_issues} issues, added ${data.added_issues} new issues, ${data.unchanged_issues} unchanged.`)
       } else {
         alert(`Failed to refresh session: ${data.error}`)
       }
@@ -592,8 +725,10 @@ const VotingSession = ({ sessionId, isCreator, creatorName, currentUser, guestUs
                         <RefreshCw className={`w-4 h-4 ${refreshingSession ? 'animate-spin' : ''}`} />
                         {refreshingSession ? 'Refreshing...' : 'Refresh Session'}
                       </Button>
-                      <Button onClick={closeSession} variant="destructive">
-                        Close Session
+                      <Button onClick={closeSession} variant="destructive" disabled={!!closeProgress}>
+                        {closeProgress
+                          ? `Closing... ${closeProgress.completed}/${closeProgress.total}`
+                          : 'Close Session'}
                       </Button>
                     </>
                   )}
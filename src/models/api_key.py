@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+import math
 import secrets
 import hashlib
 import base64
@@ -24,6 +25,8 @@ class ApiKey(db.Model):
     # Relationships
     user = db.relationship('User', backref='api_keys')
     usage_logs = db.relationship('ApiKeyUsage', backref='api_key', lazy='dynamic', cascade='all, delete-orphan')
+    usage_rollups = db.relationship('ApiKeyUsageRollup', lazy='dynamic', cascade='all, delete-orphan')
+    latency_rollups = db.relationship('ApiKeyLatencyRollup', lazy='dynamic', cascade='all, delete-orphan')
 
     @staticmethod
     def generate_api_key():
@@ -43,7 +46,11 @@ class ApiKey(db.Model):
 
     @classmethod
     def verify_key(cls, api_key):
-        """Verify an API key and return the ApiKey instance if valid"""
+        """Verify an API key and return its VerifiedApiKey if valid
+
+        Keys verified within the cache TTL are answered from memory without
+        querying the database.
+        """
         if not api_key or not api_key.startswith('jira_est_'):
             return None
 
@@ -51,26 +58,34 @@ class ApiKey(db.Model):
         if len(api_key) < 18:  # jira_est_ (9) + at least 8 chars
             return None
 
+        # Import here to avoid circular import
+        from src.services.api_key_cache import api_key_cache
+
         key_prefix = api_key[:17]  # jira_est_ + first 8 chars of suffix
         key_hash = cls.hash_key(api_key)
 
-        # Find matching key in database
-        api_key_obj = cls.query.filter_by(
-            key_prefix=key_prefix,
-            key_hash=key_hash,
-            is_active=True
-        ).first()
+        verified = api_key_cache.get(key_hash)
+        if verified is None:
+            # Find matching key in database
+            api_key_obj = cls.query.filter_by(
+                key_prefix=key_prefix,
+                key_hash=key_hash,
+                is_active=True
+            ).first()
 
-        if api_key_obj:
-            # Check if key has expired
-            if api_key_obj.expires_at and api_key_obj.expires_at < datetime.utcnow():
+            # Check if key has expired or its owner was deactivated
+            if not api_key_obj or api_key_obj.is_expired():
                 return None
+            if not api_key_obj.user or not api_key_obj.user.is_active:
+                return None
+
+            verified = VerifiedApiKey.from_api_key(api_key_obj)
+            api_key_cache.put(key_hash, verified)
 
-            # Update last used timestamp
-            api_key_obj.last_used_at = datetime.utcnow()
-            db.session.commit()
+        # Update last used timestamp (batched with other uses)
+        api_key_cache.record_use(verified.id)
 
-        return api_key_obj
+        return verified
 
     def has_scope(self, required_scope):
         """Check if the API key has the required scope"""
@@ -93,8 +108,12 @@ class ApiKey(db.Model):
 
     def revoke(self):
         """Revoke (deactivate) the API key"""
+        # Import here to avoid circular import
+        from src.services.api_key_cache import api_key_cache
+
         self.is_active = False
         db.session.commit()
+        api_key_cache.invalidate(self.id)
 
     def to_dict(self, include_full_key=False):
         """Convert to dictionary for JSON serialization"""
@@ -120,6 +139,24 @@ class ApiKey(db.Model):
         return f'<ApiKey {self.name} ({self.key_prefix}...)>'
 
 
+class VerifiedApiKey:
+    """The parts of a verified API key a request needs, safe to keep between requests"""
+
+    def __init__(self, id, user_id, name, scopes, expires_at):
+        self.id = id
+        self.user_id = user_id
+        self.name = name
+        self.scopes = scopes
+        self.expires_at = expires_at
+
+    @classmethod
+    def from_api_key(cls, api_key):
+        return cls(api_key.id, api_key.user_id, api_key.name, api_key.scopes, api_key.expires_at)
+
+    # Same checks as on the model, which only read scopes and expires_at
+    has_scope = ApiKey.has_scope
+    is_expired = ApiKey.is_expired
+
 class ApiKeyUsage(db.Model):
     __tablename__ = 'api_key_usage'
 
@@ -130,17 +167,183 @@ class ApiKeyUsage(db.Model):
     status_code = db.Column(db.Integer, nullable=True)
     ip_address = db.Column(db.String(45), nullable=True)  # IPv6 compatible
     user_agent = db.Column(db.Text, nullable=True)
+    response_size = db.Column(db.Integer, nullable=True)  # Bytes; None for streamed responses
+    latency_ms = db.Column(db.Float, nullable=True)  # Server-side time from authentication to response
     timestamp = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
+    __table_args__ = (
+        # Newest-first keyset pagination of one key's logs
+        db.Index('ix_api_key_usage_key_timestamp', 'api_key_id', 'timestamp', 'id'),
+    )
+
     def to_dict(self):
         return {
             'id': self.id,
             'endpoint': self.endpoint,
             'method': self.method,
             'status_code': self.status_code,
+            'response_size': self.response_size,
+            'latency_ms': self.latency_ms,
             'ip_address': self.ip_address,
             'timestamp': self.timestamp.isoformat() if self.timestamp else None
         }
 
     def __repr__(self):
-        return f'<ApiKeyUsage {self.method} {self.endpoint} ({self.timestamp})>'
\ No newline at end of file
+        return f'<ApiKeyUsage {self.method} {self.endpoint} ({self.timestamp})>'
+
+
+# Add usage counts to rollup rows, creating rows that don't exist yet
+UPSERT_USAGE_ROLLUP_SQL = db.text("""
+    INSERT INTO api_key_usage_rollups (api_key_id, period, period_start, endpoint, method, status_code, request_count)
+    VALUES (:api_key_id, :period, :period_start, :endpoint, :method, :status_code, :request_count)
+    ON CONFLICT (api_key_id, period, period_start, endpoint, method, status_code)
+    DO UPDATE SET request_count = api_key_usage_rollups.request_count + excluded.request_count
+""")
+
+class ApiKeyUsageRollup(db.Model):
+    """Request counts per key, endpoint, method and status for each hour and day
+
+    Maintained incrementally as usage logs are written, so usage summaries
+    don't scan the raw logs and survive their retention period.
+    """
+    __tablename__ = 'api_key_usage_rollups'
+
+    PERIODS = ('hour', 'day')
+
+    id = db.Column(db.Integer, primary_key=True)
+    api_key_id = db.Column(db.Integer, db.ForeignKey('api_keys.id'), nullable=False)
+    period = db.Column(db.String(10), nullable=False)  # hour, day
+    period_start = db.Column(db.DateTime, nullable=False)
+    endpoint = db.Column(db.String(500), nullable=False)
+    method = db.Column(db.String(10), nullable=False)
+    status_code = db.Column(db.Integer, nullable=False, default=0)  # 0 when the status wasn't recorded
+    request_count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index('ux_api_key_usage_rollup', 'api_key_id', 'period', 'period_start', 'endpoint', 'method', 'status_code', unique=True),
+    )
+
+    @staticmethod
+    def period_start_of(timestamp, period):
+        if period == 'day':
+            return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+
+    @classmethod
+    def add_usage(cls, connection, events):
+        """Count usage events (dicts with ApiKeyUsage columns) into the rollups
+
+        `connection` is db.session or a Connection; the caller commits.
+        """
+        counts = {}
+        for event in events:
+            for period in cls.PERIODS:
+                row_key = (
+                    event['api_key_id'],
+                    period,
+                    cls.period_start_of(event['timestamp'], period),
+                    event['endpoint'],
+                    event['method'],
+                    event.get('status_code') or 0
+                )
+                counts[row_key] = counts.get(row_key, 0) + 1
+
+        if counts:
+            connection.execute(UPSERT_USAGE_ROLLUP_SQL, [
+                {
+                    'api_key_id': api_key_id,
+                    'period': period,
+                    'period_start': period_start,
+                    'endpoint': endpoint,
+                    'method': method,
+                    'status_code': status_code,
+                    'request_count': request_count
+                }
+                for (api_key_id, period, period_start, endpoint, method, status_code), request_count in counts.items()
+            ])
+
+    def to_dict(self):
+        return {
+            'period': self.period,
+            'period_start': self.period_start.isoformat() if self.period_start else None,
+            'endpoint': self.endpoint,
+            'method': self.method,
+            'status_code': self.status_code or None,
+            'request_count': self.request_count
+        }
+
+
+# Add latency samples to histogram buckets, creating rows that don't exist yet
+UPSERT_LATENCY_ROLLUP_SQL = db.text("""
+    INSERT INTO api_key_latency_rollups (api_key_id, period, period_start, bucket, request_count)
+    VALUES (:api_key_id, :period, :period_start, :bucket, :request_count)
+    ON CONFLICT (api_key_id, period, period_start, bucket)
+    DO UPDATE SET request_count = api_key_latency_rollups.request_count + excluded.request_count
+""")
+
+class ApiKeyLatencyRollup(db.Model):
+    """Latency histogram per key for each hour and day
+
+    Bucket b counts requests whose latency was above BUCKET_RATIO ** (b - 1)
+    and at most BUCKET_RATIO ** b milliseconds, so percentiles read from the
+    histogram are within 5% of the exact value and cost one row per bucket
+    in use, however many requests were made.
+    """
+    __tablename__ = 'api_key_latency_rollups'
+
+    PERIODS = ApiKeyUsageRollup.PERIODS
+    BUCKET_RATIO = 1.05
+    MIN_LATENCY_MS = 0.001
+
+    id = db.Column(db.Integer, primary_key=True)
+    api_key_id = db.Column(db.Integer, db.ForeignKey('api_keys.id'), nullable=False)
+    period = db.Column(db.String(10), nullable=False)  # hour, day
+    period_start = db.Column(db.DateTime, nullable=False)
+    bucket = db.Column(db.Integer, nullable=False)
+    request_count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index('ux_api_key_latency_rollup', 'api_key_id', 'period', 'period_start', 'bucket', unique=True),
+    )
+
+    @classmethod
+    def bucket_of(cls, latency_ms):
+        return math.ceil(math.log(max(latency_ms, cls.MIN_LATENCY_MS)) / math.log(cls.BUCKET_RATIO))
+
+    @classmethod
+    def bucket_upper_bound(cls, bucket):
+        """Largest latency in milliseconds counted in a bucket"""
+        return round(cls.BUCKET_RATIO ** bucket, 3)
+
+    @classmethod
+    def add_latencies(cls, connection, events):
+        """Count the latency of usage events (dicts with ApiKeyUsage columns) into the histograms
+
+        Events without a latency are skipped. `connection` is db.session or a
+        Connection; the caller commits.
+        """
+        counts = {}
+        for event in events:
+            if event.get('latency_ms') is None:
+                continue
+            bucket = cls.bucket_of(event['latency_ms'])
+            for period in cls.PERIODS:
+                row_key = (
+                    event['api_key_id'],
+                    period,
+                    ApiKeyUsageRollup.period_start_of(event['timestamp'], period),
+                    bucket
+                )
+                counts[row_key] = counts.get(row_key, 0) + 1
+
+        if counts:
+            connection.execute(UPSERT_LATENCY_ROLLUP_SQL, [
+                {
+                    'api_key_id': api_key_id,
+                    'period': period,
+                    'period_start': period_start,
+                    'bucket': bucket,
+                    'request_count': request_count
+                }
+                for (api_key_id, period, period_start, bucket), request_count in counts.items()
+            ])
@@ -0,0 +1,60 @@
+import json
+from datetime import datetime
+from src.models.user import db
+
+class Job(db.Model):
+    __tablename__ = 'jobs'
+
+    id = db.Column(db.String(36), primary_key=True)
+    job_type = db.Column(db.String(50), nullable=False)
+    session_id = db.Column(db.String(36), nullable=True, index=True)
+    status = db.Column(db.String(20), default='queued', nullable=False, index=True)  # queued, running, succeeded, failed
+    payload = db.Column(db.Text, nullable=True)  # JSON encoded job arguments
+    progress_total = db.Column(db.Integer, default=0)
+    progress_completed = db.Column(db.Integer, default=0)
+    progress_results = db.Column(db.Text, nullable=True)  # JSON list of per-item results reported so far
+    result = db.Column(db.Text, nullable=True)  # JSON encoded final result
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)  # Last sign of life from the worker running the job
+
+    __table_args__ = (
+        # At most one queued or running job of each type per session
+        db.Index(
+            'ux_jobs_active_session_type', 'session_id', 'job_type', unique=True,
+            sqlite_where=db.text("status IN ('queued', 'running')"),
+            postgresql_where=db.text("status IN ('queued', 'running')")
+        ),
+    )
+
+    def get_payload(self):
+        return json.loads(self.payload) if self.payload else {}
+
+    def get_progress_results(self):
+        return json.loads(self.progress_results) if self.progress_results else []
+
+    def get_result(self):
+        return json.loads(self.result) if self.result else None
+
+    def is_finished(self):
+        return self.status in ('succeeded', 'failed')
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'job_type': self.job_type,
+            'session_id': self.session_id,
+            'status': self.status,
+            'progress': {
+                'total': self.progress_total or 0,
+                'completed': self.progress_completed or 0,
+                'results': self.get_progress_results()
+            },
+            'result': self.get_result(),
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
@@ -0,0 +1,202 @@
+from datetime import datetime
+from sqlalchemy import inspect, text, select, bindparam
+from src.models.user import db
+
+# Creation time given to legacy sessions with no votes or invitations to date them by
+LEGACY_SESSION_CREATED_AT = datetime(1970, 1, 1)
+
+def add_missing_columns():
+    """Add model columns that are missing from existing tables
+
+    db.create_all() only creates missing tables, so columns added to a
+    model later are added here with ALTER TABLE. New columns must be
+    nullable or have a constant server default.
+    """
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+
+                column_type = column.type.compile(dialect=db.engine.dialect)
+                ddl = f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'
+                if column.server_default is not None:
+                    default = column.server_default.arg
+                    ddl += f" DEFAULT {getattr(default, 'text', default)}"
+                conn.execute(text(ddl))
+
+def add_missing_indexes():
+    """Create model indexes that are missing from existing tables"""
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+def remove_duplicate_rows(conn):
+    """Keep only the newest row per voter/issue, session/issue and session/invitee"""
+    existing_tables = set(inspect(conn).get_table_names())
+
+    if 'vote' in existing_tables:
+        conn.execute(text(
+            'DELETE FROM vote WHERE user_id IS NOT NULL AND id NOT IN ('
+            'SELECT MAX(id) FROM vote WHERE user_id IS NOT NULL GROUP BY session_id, issue_key, user_id)'
+        ))
+        conn.execute(text(
+            'DELETE FROM vote WHERE user_id IS NULL AND id NOT IN ('
+            'SELECT MAX(id) FROM vote WHERE user_id IS NULL GROUP BY session_id, issue_key, voter_name)'
+        ))
+    if 'jira_issue' in existing_tables:
+        conn.execute(text(
+            'DELETE FROM jira_issue WHERE id NOT IN ('
+            'SELECT MAX(id) FROM jira_issue GROUP BY session_id, issue_key)'
+        ))
+    if 'session_invitations' in existing_tables:
+        conn.execute(text(
+            'DELETE FROM session_invitations WHERE id NOT IN ('
+            'SELECT MAX(id) FROM session_invitations GROUP BY session_id, user_id)'
+        ))
+
+def build_usage_rollups(conn):
+    """Count usage logs written before rollups existed into the hourly and daily rollups"""
+    from src.models.api_key import ApiKeyUsage, ApiKeyUsageRollup
+
+    if 'api_key_usage' not in set(inspect(conn).get_table_names()):
+        return
+
+    usage = ApiKeyUsage.__table__
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(usage.c.id, usage.c.api_key_id, usage.c.endpoint, usage.c.method, usage.c.status_code, usage.c.timestamp)
+            .where(usage.c.id > last_id)
+            .order_by(usage.c.id)
+            .limit(5000)
+        ).mappings().all()
+        if not rows:
+            return
+        ApiKeyUsageRollup.add_usage(conn, [row for row in rows if row['timestamp'] is not None])
+        last_id = rows[-1]['id']
+
+def fail_duplicate_active_jobs(conn):
+    """Keep only the oldest queued/running job per session and type before adding the unique index"""
+    if 'jobs' not in set(inspect(conn).get_table_names()):
+        return
+
+    conn.execute(text(
+        "UPDATE jobs SET status = 'failed', error = 'Superseded by an earlier job for the same session', "
+        "finished_at = :now WHERE status IN ('queued', 'running') AND session_id IS NOT NULL AND EXISTS ("
+        "SELECT 1 FROM jobs AS earlier WHERE earlier.session_id = jobs.session_id "
+        "AND earlier.job_type = jobs.job_type AND earlier.status IN ('queued', 'running') "
+        "AND (earlier.created_at < jobs.created_at OR (earlier.created_at = jobs.created_at AND earlier.id < jobs.id)))"
+    ), {'now': datetime.utcnow()})
+
+def backfill_session_created_at(conn):
+    """Give sessions created before created_at was recorded a creation time that sorts them last
+
+    Session lists page on (created_at, id), newest first, and would otherwise have to sort
+    NULLs separately. A legacy session gets its earliest vote or invitation time, capped at
+    the oldest recorded creation time, or LEGACY_SESSION_CREATED_AT if there is neither.
+    """
+    tables = set(inspect(conn).get_table_names())
+    if 'voting_session' not in tables:
+        return
+
+    legacy_ids = conn.execute(text('SELECT session_id FROM voting_session WHERE created_at IS NULL')).scalars().all()
+    if not legacy_ids:
+        return
+
+    oldest = conn.execute(
+        text('SELECT MIN(created_at) AS created_at FROM voting_session').columns(created_at=db.DateTime)
+    ).scalar()
+
+    activity = []
+    if 'vote' in tables:
+        activity.append('SELECT session_id, MIN(voted_at) AS at FROM vote GROUP BY session_id')
+    if 'session_invitations' in tables:
+        activity.append('SELECT session_id, MIN(invited_at) AS at FROM session_invitations GROUP BY session_id')
+
+    earliest = {}
+    for query in activity:
+        for session_id, at in conn.execute(text(query).columns(at=db.DateTime)):
+            if at is not None and (session_id not in earliest or at < earliest[session_id]):
+                earliest[session_id] = at
+
+    updates = []
+    for session_id in legacy_ids:
+        known = [at for at in (earliest.get(session_id), oldest) if at is not None]
+        updates.append({'session_id': session_id, 'created_at': min(known) if known else LEGACY_SESSION_CREATED_AT})
+    conn.execute(
+        text('UPDATE voting_session SET created_at = :created_at WHERE session_id = :session_id')
+        .bindparams(bindparam('created_at', type_=db.DateTime)),
+        updates
+    )
+
+def build_latency_rollups(conn):
+    """Count the latency of existing usage logs into the latency histograms
+
+    Also drops the raw-log latency index, which percentiles no longer read.
+    """
+    from src.models.api_key import ApiKeyUsage, ApiKeyLatencyRollup
+
+    conn.execute(text('DROP INDEX IF EXISTS ix_api_key_usage_key_latency'))
+    if 'api_key_usage' not in set(inspect(conn).get_table_names()):
+        return
+
+    usage = ApiKeyUsage.__table__
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            select(usage.c.id, usage.c.api_key_id, usage.c.latency_ms, usage.c.timestamp)
+            .where(usage.c.id > last_id)
+            .order_by(usage.c.id)
+            .limit(5000)
+        ).mappings().all()
+        if not rows:
+            return
+        ApiKeyLatencyRollup.add_latencies(conn, [row for row in rows if row['timestamp'] is not None])
+        last_id = rows[-1]['id']
+
+# Versioned data migrations, applied once each in order and recorded in schema_version.
+# They run after missing columns are added and before missing indexes are created,
+# and must also be safe on a freshly created database.
+MIGRATIONS = [
+    (1, 'Remove duplicate votes, issues and invitations before adding unique indexes', remove_duplicate_rows),
+    (2, 'Build API key usage rollups from existing usage logs', build_usage_rollups),
+    (3, 'Fail duplicate queued/running jobs before adding their unique index', fail_duplicate_active_jobs),
+    (4, 'Backfill missing session creation times', backfill_session_created_at),
+    (5, 'Build API key latency histograms from existing usage logs', build_latency_rollups),
+]
+
+def run_migrations():
+    """Apply migrations newer than the version recorded in the database"""
+    with db.engine.begin() as conn:
+        conn.execute(text(
+            'CREATE TABLE IF NOT EXISTS schema_version ('
+            'version INTEGER PRIMARY KEY, description VARCHAR(255), applied_at TIMESTAMP)'
+        ))
+        current_version = conn.execute(text('SELECT MAX(version) FROM schema_version')).scalar() or 0
+
+    for version, description, migrate in MIGRATIONS:
+        if version <= current_version:
+            continue
+        # Each migration commits together with its version row
+        with db.engine.begin() as conn:
+            migrate(conn)
+            conn.execute(
+                text('INSERT INTO schema_version (version, description, applied_at) VALUES (:version, :description, :applied_at)'),
+                {'version': version, 'description': description, 'applied_at': datetime.utcnow()}
+            )
+
+def upgrade_schema():
+    """Bring an existing database up to date with the models"""
+    db.create_all()
+    add_missing_columns()
+    run_migrations()
+    add_missing_indexes()
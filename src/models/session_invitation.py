@@ -15,6 +15,10 @@ class SessionInvitation(db.Model):
     # Relationships
     invited_by = db.relationship('User', foreign_keys=[invited_by_id], backref='sent_invitations')
 
+    __table_args__ = (
+        db.Index('ux_session_invitation_session_user', 'session_id', 'user_id', unique=True),
+    )
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -32,33 +32,52 @@ class User(db.Model):
 
     def get_owned_sessions(self):
         """Get sessions created by this user"""
-        return self.owned_sessions.all()
+        return self.owned_sessions_query().all()
+
+    def owned_sessions_query(self):
+        """Query for sessions created by this user"""
+        # Import here to avoid circular import
+        from src.models.voting_session import VotingSession
+        return VotingSession.query.options(db.joinedload(VotingSession.creator)).filter(
+            VotingSession.creator_id == self.id
+        )
 
     def get_invited_sessions(self):
         """Get open sessions user is invited to"""
+        return self.invited_sessions_query().all()
+
+    def invited_sessions_query(self):
+        """Query for open sessions user is invited to"""
         # Import here to avoid circular import
         from src.models.voting_session import VotingSession
-        invited_session_ids = [inv.session_id for inv in self.invitations.filter_by(status='pending').all()]
-        return VotingSession.query.filter(
+        from src.models.session_invitation import SessionInvitation
+        invited_session_ids = db.session.query(SessionInvitation.session_id).filter_by(user_id=self.id, status='pending')
+        return VotingSession.query.options(db.joinedload(VotingSession.creator)).filter(
             VotingSession.session_id.in_(invited_session_ids),
             VotingSession.is_closed == False
-        ).all()
+        )
 
     def get_participated_sessions(self):
         """Get closed sessions where user participated"""
-        # Import here to avoid circular import
-        from src.models.voting_session import VotingSession
-        # Get sessions where user voted
-        voted_session_ids = [vote.session_id for vote in self.votes.all()]
-        # Get sessions where user was invited and accepted
-        invited_session_ids = [inv.session_id for inv in self.invitations.filter_by(status='accepted').all()]
+        return self.participated_sessions_query().all()
 
-        all_session_ids = list(set(voted_session_ids + invited_session_ids))
-
-        return VotingSession.query.filter(
-            VotingSession.session_id.in_(all_session_ids),
+    def participated_sessions_query(self):
+        """Query for closed sessions where user participated"""
+        # Import here to avoid circular import
+        from src.models.voting_session import VotingSession, Vote
+        from src.models.session_invitation import SessionInvitation
+        # Sessions where user voted
+        voted_session_ids = db.session.query(Vote.session_id).filter_by(user_id=self.id)
+        # Sessions where user was invited and accepted
+        invited_session_ids = db.session.query(SessionInvitation.session_id).filter_by(user_id=self.id, status='accepted')
+
+        return VotingSession.query.options(db.joinedload(VotingSession.creator)).filter(
+            db.or_(
+                VotingSession.session_id.in_(voted_session_ids),
+                VotingSession.session_id.in_(invited_session_ids)
+            ),
             VotingSession.is_closed == True
-        ).all()
+        )
 
     def get_owned_teams(self):
         """Get teams created by this user"""
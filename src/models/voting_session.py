@@ -1,4 +1,6 @@
 from datetime import datetime
+from sqlalchemy import update
+from sqlalchemy.orm.attributes import set_committed_value
 from src.models.user import db
 
 class VotingSession(db.Model):
@@ -20,7 +22,16 @@ class VotingSession(db.Model):
     voting_mode = db.Column(db.String(20), default='story_points', nullable=False)
 
     is_closed = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    last_synced_at = db.Column(db.DateTime, nullable=True)  # When issues were last fetched from Jira
+
+    # Incremented on every vote, issue or status change; rows store the version that last changed them
+    version = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+
+    # Dashboard lists page through a creator's sessions newest first
+    __table_args__ = (
+        db.Index('ix_voting_session_creator_created', 'creator_id', 'created_at', 'id'),
+    )
 
     # Relationships
     issues = db.relationship('JiraIssue', backref='session', lazy='dynamic', cascade='all, delete-orphan')
@@ -48,23 +59,44 @@ class VotingSession(db.Model):
             return self.creator_name == user_name
         return False
 
+    def bump_version(self):
+        """Atomically increment the session version and return the new value"""
+        version = db.session.execute(
+            update(VotingSession)
+            .where(VotingSession.id == self.id)
+            .values(version=VotingSession.version + 1)
+            .returning(VotingSession.version)
+            .execution_options(synchronize_session=False)
+        ).scalar_one()
+        set_committed_value(self, 'version', version)
+        return version
+
     def delete_session(self):
         """Delete the session and all associated data"""
         # Delete all votes first
         Vote.query.filter_by(session_id=self.session_id).delete()
         # Delete all issues
         JiraIssue.query.filter_by(session_id=self.session_id).delete()
+        RemovedIssue.query.filter_by(session_id=self.session_id).delete()
         # Delete the session itself
         db.session.delete(self)
         db.session.commit()
 
     def remove_issue(self, issue_key):
-        """Remove a specific issue and all its votes from the session"""
+        """Remove a specific issue and all its votes from the session. Returns the new session version."""
         # Delete all votes for this issue
         Vote.query.filter_by(session_id=self.session_id, issue_key=issue_key).delete()
         # Delete the issue
         JiraIssue.query.filter_by(session_id=self.session_id, issue_key=issue_key).delete()
+        # Record the removal so polling clients can drop it from their copy
+        version = self.bump_version()
+        removed_issue = RemovedIssue.query.filter_by(session_id=self.session_id, issue_key=issue_key).first()
+        if removed_issue:
+            removed_issue.version = version
+        else:
+            db.session.add(RemovedIssue(session_id=self.session_id, issue_key=issue_key, version=version))
         db.session.commit()
+        return version
 
     def to_dict(self):
         return {
@@ -76,7 +108,9 @@ class VotingSession(db.Model):
             'creator_id': self.creator_id,
             'voting_mode': self.voting_mode,
             'is_closed': self.is_closed,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'last_synced_at': self.last_synced_at.isoformat() if self.last_synced_at else None,
+            'version': self.version
         }
 
 class JiraIssue(db.Model):
@@ -85,11 +119,19 @@ class JiraIssue(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     session_id = db.Column(db.String(36), db.ForeignKey('voting_session.session_id'), nullable=False)
     issue_key = db.Column(db.String(50), nullable=False)
+    jira_id = db.Column(db.String(50), nullable=True)  # Jira's numeric issue ID, which bulk edit reports failures by
     issue_title = db.Column(db.String(500), nullable=False)
     issue_description = db.Column(db.Text)
     acceptance_criteria = db.Column(db.Text)  # Custom field customfield_12315940
     current_story_points = db.Column(db.Float, nullable=True)  # Current story points from Jira (customfield_12310243)
     issue_url = db.Column(db.String(500), nullable=False)
+    jira_updated = db.Column(db.DateTime, nullable=True)  # Jira's 'updated' timestamp (UTC) when last synced
+    version = db.Column(db.Integer, default=0, server_default='0', nullable=False)  # Session version of the last change
+
+    __table_args__ = (
+        db.Index('ix_jira_issue_session_version', 'session_id', 'version'),
+        db.Index('ux_jira_issue_session_key', 'session_id', 'issue_key', unique=True),
+    )
 
     def to_dict(self):
         return {
@@ -100,7 +142,9 @@ class JiraIssue(db.Model):
             'issue_description': self.issue_description,
             'acceptance_criteria': self.acceptance_criteria,
             'current_story_points': self.current_story_points,
-            'issue_url': self.issue_url
+            'issue_url': self.issue_url,
+            'jira_updated': self.jira_updated.isoformat() if self.jira_updated else None,
+            'version': self.version
         }
 
 class Vote(db.Model):
@@ -118,6 +162,22 @@ class Vote(db.Model):
 
     estimation = db.Column(db.String(10), nullable=False)  # Story points like 1, 2, 3, 5, 8, 13, etc.
     voted_at = db.Column(db.DateTime, default=datetime.utcnow)
+    version = db.Column(db.Integer, default=0, server_default='0', nullable=False)  # Session version of the last change
+
+    __table_args__ = (
+        db.Index('ix_vote_session_version', 'session_id', 'version'),
+        db.Index('ix_vote_session_user', 'session_id', 'user_id'),
+        db.Index('ix_vote_session_voter', 'session_id', 'voter_name', 'user_id'),
+        # One vote per issue per voter: by user_id for accounts, by voter_name for guests
+        db.Index(
+            'ux_vote_session_issue_user', 'session_id', 'issue_key', 'user_id', unique=True,
+            sqlite_where=db.text('user_id IS NOT NULL'), postgresql_where=db.text('user_id IS NOT NULL')
+        ),
+        db.Index(
+            'ux_vote_session_issue_voter', 'session_id', 'issue_key', 'voter_name', unique=True,
+            sqlite_where=db.text('user_id IS NULL'), postgresql_where=db.text('user_id IS NULL')
+        ),
+    )
 
     def get_voter_name(self):
         """Get voter name - from User if available, fallback to voter_name field"""
@@ -133,5 +193,19 @@ class Vote(db.Model):
             'voter_name': self.get_voter_name(),
             'user_id': self.user_id,
             'estimation': self.estimation,
-            'voted_at': self.voted_at.isoformat() if self.voted_at else None
-        }
\ No newline at end of file
+            'voted_at': self.voted_at.isoformat() if self.voted_at else None,
+            'version': self.version
+        }
+
+class RemovedIssue(db.Model):
+    """Issue removed from a session, kept so polling clients can catch up"""
+    __tablename__ = 'removed_issue'
+
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.String(36), db.ForeignKey('voting_session.session_id'), nullable=False)
+    issue_key = db.Column(db.String(50), nullable=False)
+    version = db.Column(db.Integer, nullable=False)  # Session version of the removal
+
+    __table_args__ = (
+        db.Index('ix_removed_issue_session_version', 'session_id', 'version'),
+    )
@@ -1,11 +1,118 @@
+import base64
+import binascii
+import math
 from flask import Blueprint, request, jsonify, session
 from datetime import datetime, timedelta
+from sqlalchemy import func, or_, and_
 from src.models.user import db, User
-from src.models.api_key import ApiKey, ApiKeyUsage
+from src.models.api_key import ApiKey, ApiKeyUsage, ApiKeyUsageRollup, ApiKeyLatencyRollup
+from src.services.api_key_cache import api_key_cache
+from src.services.api_usage_log import api_usage_log
+from src.services.auth_resolver import get_principal, get_request_api_key
 import functools
 
 api_keys_bp = Blueprint('api_keys', __name__)
 
+USAGE_LOGS_PAGE_SIZE = 50
+MAX_USAGE_LOGS_PAGE_SIZE = 100
+USAGE_SUMMARY_DAYS = 30
+
+def encode_usage_cursor(usage_log):
+    """Opaque cursor pointing just after a usage log in newest-first order"""
+    position = f"{usage_log.timestamp.isoformat()}|{usage_log.id}"
+    return base64.urlsafe_b64encode(position.encode('utf-8')).decode('ascii')
+
+def decode_usage_cursor(cursor):
+    """Parse a cursor into (timestamp, id). Raises ValueError if it is malformed."""
+    try:
+        timestamp, usage_id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+        return datetime.fromisoformat(timestamp), int(usage_id)
+    except (TypeError, ValueError, UnicodeError, binascii.Error):
+        raise ValueError('invalid cursor')
+
+def paginate_usage_logs(api_key_id, cursor, limit):
+    """One page of a key's usage logs, newest first, continuing after `cursor`
+
+    Uses keyset pagination on (timestamp, id), so deep pages cost the same
+    as the first one. Returns (usage_logs, next_cursor).
+    """
+    query = ApiKeyUsage.query.filter_by(api_key_id=api_key_id)
+    if cursor:
+        timestamp, usage_id = decode_usage_cursor(cursor)
+        query = query.filter(or_(
+            ApiKeyUsage.timestamp < timestamp,
+            and_(ApiKeyUsage.timestamp == timestamp, ApiKeyUsage.id < usage_id)
+        ))
+
+    usage_logs = query.order_by(ApiKeyUsage.timestamp.desc(), ApiKeyUsage.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(usage_logs) > limit:
+        usage_logs = usage_logs[:limit]
+        next_cursor = encode_usage_cursor(usage_logs[-1])
+    return usage_logs, next_cursor
+
+LATENCY_PERCENTILES = (50, 95, 99)
+
+def latency_percentiles(api_key_id, period, since):
+    """p50/p95/p99 latency in milliseconds of a key's requests since `since`
+
+    Nearest-rank percentiles read from the hourly/daily latency histograms,
+    so the cost depends on the number of buckets in use rather than the
+    number of requests. Each value is the upper bound of its bucket, within
+    5% of the exact latency.
+    """
+    histogram = db.session.query(ApiKeyLatencyRollup.bucket, func.sum(ApiKeyLatencyRollup.request_count)).filter(
+        ApiKeyLatencyRollup.api_key_id == api_key_id,
+        ApiKeyLatencyRollup.period == period,
+        ApiKeyLatencyRollup.period_start >= since
+    ).group_by(ApiKeyLatencyRollup.bucket).order_by(ApiKeyLatencyRollup.bucket).all()
+    sample_count = sum(count for _, count in histogram)
+
+    latency = {'samples': sample_count}
+    for percentile in LATENCY_PERCENTILES:
+        value = None
+        if sample_count:
+            rank = max(1, math.ceil(percentile / 100 * sample_count))
+            seen = 0
+            for bucket, count in histogram:
+                seen += count
+                if seen >= rank:
+                    value = ApiKeyLatencyRollup.bucket_upper_bound(bucket)
+                    break
+        latency[f'p{percentile}_ms'] = value
+    return latency
+
+def usage_summary(api_key_id, period, since):
+    """Request counts of a key since `since`, per period, endpoint and status, from the rollups"""
+    rollups = db.session.query(ApiKeyUsageRollup).filter(
+        ApiKeyUsageRollup.api_key_id == api_key_id,
+        ApiKeyUsageRollup.period == period,
+        ApiKeyUsageRollup.period_start >= since
+    )
+    request_count = func.sum(ApiKeyUsageRollup.request_count)
+
+    series = rollups.with_entities(ApiKeyUsageRollup.period_start, request_count) \
+        .group_by(ApiKeyUsageRollup.period_start).order_by(ApiKeyUsageRollup.period_start).all()
+    by_endpoint = rollups.with_entities(ApiKeyUsageRollup.endpoint, ApiKeyUsageRollup.method, request_count) \
+        .group_by(ApiKeyUsageRollup.endpoint, ApiKeyUsageRollup.method).order_by(request_count.desc()).all()
+    by_status = rollups.with_entities(ApiKeyUsageRollup.status_code, request_count) \
+        .group_by(ApiKeyUsageRollup.status_code).order_by(ApiKeyUsageRollup.status_code).all()
+
+    return {
+        'period': period,
+        'since': since.isoformat(),
+        'total_requests': sum(count for _, count in series),
+        'series': [{'period_start': start.isoformat(), 'request_count': count} for start, count in series],
+        'by_endpoint': [
+            {'endpoint': endpoint, 'method': method, 'request_count': count}
+            for endpoint, method, count in by_endpoint
+        ],
+        # status_code is None for requests logged without one
+        'by_status': [{'status_code': status_code or None, 'request_count': count} for status_code, count in by_status],
+        'latency': latency_percentiles(api_key_id, period, since)
+    }
+
 def login_required(f):
     """Decorator to require authentication for API key management endpoints"""
     @functools.wraps(f)
@@ -27,15 +134,14 @@ def api_key_auth_required(scopes=None):
         @functools.wraps(f)
         def decorated_function(*args, **kwargs):
             # Check for API key in headers
-            api_key = request.headers.get('X-API-Key') or request.headers.get('Authorization', '').replace('Bearer ', '')
-
-            if not api_key:
+            if not get_request_api_key():
                 return jsonify({'error': 'API key required'}), 401
 
-            # Verify API key
-            api_key_obj = ApiKey.verify_key(api_key)
-            if not api_key_obj:
+            # Verify API key (also logs its usage once the response is ready)
+            principal = get_principal()
+            if not principal or not principal.api_key:
                 return jsonify({'error': 'Invalid or expired API key'}), 401
+            api_key_obj = principal.api_key
 
             # Check scopes if specified
             if scopes:
@@ -43,25 +149,9 @@ def api_key_auth_required(scopes=None):
                 if not any(api_key_obj.has_scope(scope) for scope in required_scopes):
                     return jsonify({'error': f'Insufficient permissions. Required scopes: {", ".join(required_scopes)}'}), 403
 
-            # Log API key usage
-            try:
-                usage_log = ApiKeyUsage(
-                    api_key_id=api_key_obj.id,
-                    endpoint=request.endpoint or request.path,
-                    method=request.method,
-                    ip_address=request.remote_addr,
-                    user_agent=request.headers.get('User-Agent', '')
-                )
-                db.session.add(usage_log)
-                db.session.commit()
-            except Exception as e:
-                # Don't fail the request if logging fails
-                from flask import current_app
-                current_app.logger.error(f"Failed to log API key usage: {e}")
-
             # Add API key info to request context
             request.api_key = api_key_obj
-            request.api_key_user = api_key_obj.user
+            request.api_key_user = principal.user
 
             return f(*args, **kwargs)
         return decorated_function
@@ -171,6 +261,8 @@ def delete_api_key(user, key_id):
         # Delete the API key and its usage logs
         db.session.delete(api_key)
         db.session.commit()
+        api_key_cache.invalidate(key_id)
+        api_usage_log.discard(key_id)
 
         return jsonify({'message': 'API key deleted successfully'}), 200
 
@@ -202,38 +294,51 @@ def revoke_api_key(user, key_id):
 @api_keys_bp.route('/<int:key_id>/usage', methods=['GET'])
 @login_required
 def get_api_key_usage(user, key_id):
-    """Get usage logs for an API key"""
+    """Get the usage summary and usage logs of an API key
+
+    The summary is read from the hourly/daily rollups and latency
+    histograms over the last `days` days. Logs are listed newest first; pass `next_cursor` back as `cursor`
+    to get the following page.
+    """
     try:
         api_key = ApiKey.query.filter_by(id=key_id, user_id=user.id).first()
 
         if not api_key:
             return jsonify({'error': 'API key not found'}), 404
 
-        # Get pagination parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = min(request.args.get('per_page', 50, type=int), 100)  # Max 100 per page
+        limit = request.args.get('limit', request.args.get('per_page', USAGE_LOGS_PAGE_SIZE), type=int)
+        limit = max(1, min(limit, MAX_USAGE_LOGS_PAGE_SIZE))
+        period = request.args.get('period', 'day')
+        if period not in ApiKeyUsageRollup.PERIODS:
+            return jsonify({'error': 'period must be hour or day'}), 400
+        days = max(1, request.args.get('days', USAGE_SUMMARY_DAYS, type=int))
 
-        # Get usage logs
-        usage_logs = api_key.usage_logs.order_by(ApiKeyUsage.timestamp.desc()).paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
+        try:
+            usage_logs, next_cursor = paginate_usage_logs(api_key.id, request.args.get('cursor'), limit)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        since = ApiKeyUsageRollup.period_start_of(datetime.utcnow() - timedelta(days=days), period)
 
         return jsonify({
             'api_key': api_key.to_dict(),
-            'usage_logs': [log.to_dict() for log in usage_logs.items],
+            'summary': usage_summary(api_key.id, period, since),
+            'usage_logs': [log.to_dict() for log in usage_logs],
             'pagination': {
-                'page': page,
-                'pages': usage_logs.pages,
-                'per_page': per_page,
-                'total': usage_logs.total
+                'limit': limit,
+                'next_cursor': next_cursor
             }
         }), 200
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@api_keys_bp.route('/usage-log-stats', methods=['GET'])
+@login_required
+def get_usage_log_stats(user):
+    """Report how many usage events this worker has buffered, written and dropped"""
+    return jsonify(api_usage_log.get_stats()), 200
+
 # Example protected endpoint that requires API key authentication
 @api_keys_bp.route('/test', methods=['GET'])
 @api_key_auth_required(['read'])
@@ -1,7 +1,13 @@
+import base64
+import binascii
+from datetime import datetime
 from flask import Blueprint, request, jsonify, session, current_app
+from sqlalchemy import func, case, or_, tuple_
 from src.models.user import db, User
 from src.models.session_invitation import SessionInvitation
-from src.services.email_service import send_welcome_email, send_session_invitation_email
+from src.services.email_service import send_welcome_email, send_session_invitation_email, send_session_invitation_emails
+from src.services.http_cache import make_etag, not_modified, add_etag
+from src.services.auth_resolver import get_current_user, get_current_user_id
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -47,7 +53,9 @@ def register():
             mail = current_app.extensions.get('mail')
             if mail:
                 send_welcome_email(mail, user.email, user.username)
+                db.session.commit()  # Queues the email when the mail queue is running
         except Exception as e:
+            db.session.rollback()
             # Log error but don't fail registration
             current_app.logger.error(f"Failed to send welcome email to {user.email}: {str(e)}")
 
@@ -101,78 +109,227 @@ def logout():
 
 @auth_bp.route('/current-user', methods=['GET'])
 def current_user():
-    user_id = session.get('user_id')
+    user_id = get_current_user_id()
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
 
-    user = User.query.get(user_id)
+    user = get_current_user()
     if not user or not user.is_active:
         session.clear()
         return jsonify({'error': 'User not found or inactive'}), 401
 
     return jsonify({'user': user.to_dict()}), 200
 
+# Sessions returned per list by user-sessions, unless the request asks for fewer
+SESSIONS_PAGE_SIZE = 20
+MAX_SESSIONS_PAGE_SIZE = 100
+
+SESSION_LISTS = ('owned', 'invited', 'participated')
+
+def encode_session_cursor(session_obj):
+    """Opaque cursor pointing just after a session in newest-first order"""
+    position = f"{session_obj.created_at.isoformat()}|{session_obj.id}"
+    return base64.urlsafe_b64encode(position.encode('utf-8')).decode('ascii')
+
+def decode_session_cursor(cursor):
+    """Parse a cursor into (created_at, id). Raises ValueError if it is malformed."""
+    try:
+        created_at, session_pk = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+        return datetime.fromisoformat(created_at), int(session_pk)
+    except (TypeError, ValueError, UnicodeError, binascii.Error):
+        raise ValueError('invalid cursor')
+
+def parse_session_filters(args):
+    """SQL criteria for the status, voting_mode and created date filters of user-sessions"""
+    from src.models.voting_session import VotingSession
+
+    criteria = []
+    status = args.get('status')
+    if status:
+        if status not in ('open', 'closed'):
+            raise ValueError('status must be open or closed')
+        criteria.append(VotingSession.is_closed == (status == 'closed'))
+
+    voting_mode = args.get('voting_mode')
+    if voting_mode:
+        criteria.append(VotingSession.voting_mode == voting_mode)
+
+    created_after = args.get('created_after')
+    if created_after:
+        criteria.append(VotingSession.created_at >= datetime.fromisoformat(created_after))
+
+    created_before = args.get('created_before')
+    if created_before:
+        criteria.append(VotingSession.created_at < datetime.fromisoformat(created_before))
+
+    return criteria
+
+def paginate_sessions(query, criteria, cursor, limit):
+    """One page of sessions, newest first, continuing after `cursor`
+
+    Uses keyset pagination on (created_at, id), which the
+    (creator_id, created_at, id) index serves in order, so a page costs the
+    same however many sessions come before it. Returns (sessions, next_cursor).
+    """
+    from src.models.voting_session import VotingSession
+
+    query = query.filter(*criteria)
+    if cursor:
+        created_at, session_pk = decode_session_cursor(cursor)
+        query = query.filter(tuple_(VotingSession.created_at, VotingSession.id) < tuple_(created_at, session_pk))
+
+    sessions = query.order_by(VotingSession.created_at.desc(), VotingSession.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(sessions) > limit:
+        sessions = sessions[:limit]
+        next_cursor = encode_session_cursor(sessions[-1])
+    return sessions, next_cursor
+
+def owned_sessions_with_stats(owned_sessions):
+    """Serialize owned sessions with their voting statistics, using one query per statistic"""
+    from src.models.voting_session import Vote
+
+    page_session_ids = [session_obj.session_id for session_obj in owned_sessions]
+
+    # Count invitations and unique voters for the whole page at once
+    invitation_counts = dict(
+        db.session.query(SessionInvitation.session_id, func.count(SessionInvitation.id))
+        .filter(SessionInvitation.session_id.in_(page_session_ids))
+        .group_by(SessionInvitation.session_id)
+        .all()
+    )
+    # Authenticated voters count by user_id, others by voter_name
+    voter_counts = dict(
+        db.session.query(
+            Vote.session_id,
+            func.count(func.distinct(Vote.user_id)) +
+            func.count(func.distinct(case((Vote.user_id.is_(None), Vote.voter_name))))
+        )
+        .filter(Vote.session_id.in_(page_session_ids))
+        .group_by(Vote.session_id)
+        .all()
+    )
+
+    owned_sessions_data = []
+    for session_obj in owned_sessions:
+        session_dict = session_obj.to_dict()
+
+        # Add voting statistics for owned sessions
+        # Count total people who can vote (creator + invited users)
+        total_invitations = invitation_counts.get(session_obj.session_id, 0)
+        total_invited = total_invitations + 1  # +1 for the creator
+
+        # Add voting statistics to session data
+        session_dict['voting_stats'] = {
+            'voters_count': voter_counts.get(session_obj.session_id, 0),
+            'total_invited': total_invited,
+            'total_invitations': total_invitations
+        }
+
+        owned_sessions_data.append(session_dict)
+
+    return owned_sessions_data
+
+def user_sessions_etag(user):
+    """ETag for a user's session lists, computed from a few aggregates
+
+    Votes, issue changes and closing all bump a session's version, so the
+    sum of versions changes whenever a listed session does. Invitation
+    counts and response times cover invitation changes. The query string
+    is included since it selects the page and filters.
+    """
+    from src.models.voting_session import VotingSession, Vote
+
+    voted_session_ids = db.session.query(Vote.session_id).filter(Vote.user_id == user.id)
+    invited_session_ids = db.session.query(SessionInvitation.session_id).filter(SessionInvitation.user_id == user.id)
+    owned_session_ids = db.session.query(VotingSession.session_id).filter(VotingSession.creator_id == user.id)
+
+    session_stats = db.session.query(
+        func.count(VotingSession.id),
+        func.max(VotingSession.id),
+        func.sum(VotingSession.version),
+        func.max(VotingSession.last_synced_at)
+    ).filter(or_(
+        VotingSession.creator_id == user.id,
+        VotingSession.session_id.in_(voted_session_ids),
+        VotingSession.session_id.in_(invited_session_ids)
+    )).one()
+
+    invitation_stats = db.session.query(
+        func.count(SessionInvitation.id),
+        func.max(SessionInvitation.id),
+        func.max(SessionInvitation.responded_at)
+    ).filter(or_(
+        SessionInvitation.user_id == user.id,
+        SessionInvitation.session_id.in_(owned_session_ids)
+    )).one()
+
+    return make_etag(user.id, user.username, request.query_string, *session_stats, *invitation_stats)
+
 @auth_bp.route('/user-sessions', methods=['GET'])
 def user_sessions():
-    user_id = session.get('user_id')
+    """Get the user's owned, invited and participated sessions, a page of each
+
+    Optional query parameters: list (owned, invited or participated, to
+    fetch only that list), cursor (next_cursors value from the previous
+    page of that list), limit, status (open/closed), voting_mode,
+    created_after and created_before (ISO dates).
+    """
+    user_id = get_current_user_id()
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
 
-    user = User.query.get(user_id)
+    user = get_current_user()
     if not user:
         return jsonify({'error': 'User not found'}), 404
 
     try:
-        # Import here to avoid circular import
-        from src.models.voting_session import VotingSession, Vote
-
-        # Get basic session data
-        owned_sessions_data = []
-        for session_obj in user.get_owned_sessions():
-            session_dict = session_obj.to_dict()
-
-            # Add voting statistics for owned sessions
-            # Count total people who can vote (creator + invited users)
-            total_invitations = SessionInvitation.query.filter_by(session_id=session_obj.session_id).count()
-            total_invited = total_invitations + 1  # +1 for the creator
-
-            # Count unique voters who have actually voted
-            votes = Vote.query.filter_by(session_id=session_obj.session_id).all()
-            unique_voters = set()
-            for vote in votes:
-                if vote.user_id:
-                    # Authenticated voter
-                    unique_voters.add(f"user_{vote.user_id}")
-                elif vote.voter_name:
-                    # Non-authenticated voter
-                    unique_voters.add(f"name_{vote.voter_name}")
-
-            voters_count = len(unique_voters)
-
-            # Add voting statistics to session data
-            session_dict['voting_stats'] = {
-                'voters_count': voters_count,
-                'total_invited': total_invited,
-                'total_invitations': total_invitations
-            }
-
-            owned_sessions_data.append(session_dict)
-
-        invited_sessions = [s.to_dict() for s in user.get_invited_sessions()]
-        participated_sessions = [s.to_dict() for s in user.get_participated_sessions()]
+        requested_list = request.args.get('list')
+        if requested_list and requested_list not in SESSION_LISTS:
+            return jsonify({'error': f"list must be one of {', '.join(SESSION_LISTS)}"}), 400
 
-        return jsonify({
-            'owned_sessions': owned_sessions_data,
-            'invited_sessions': invited_sessions,
-            'participated_sessions': participated_sessions
-        }), 200
+        cursor = request.args.get('cursor')
+        if cursor and not requested_list:
+            return jsonify({'error': 'A cursor requires the list parameter'}), 400
+
+        try:
+            limit = min(MAX_SESSIONS_PAGE_SIZE, max(1, int(request.args.get('limit', SESSIONS_PAGE_SIZE))))
+            criteria = parse_session_filters(request.args)
+            if cursor:
+                decode_session_cursor(cursor)
+        except ValueError as e:
+            return jsonify({'error': f'Invalid parameter: {str(e)}'}), 400
+
+        # Answer unchanged polls before loading any sessions
+        etag = user_sessions_etag(user)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+
+        queries = {
+            'owned': user.owned_sessions_query(),
+            'invited': user.invited_sessions_query(),
+            'participated': user.participated_sessions_query()
+        }
+
+        result = {'next_cursors': {}}
+        for list_name in ([requested_list] if requested_list else SESSION_LISTS):
+            sessions, next_cursor = paginate_sessions(queries[list_name], criteria, cursor, limit)
+            if list_name == 'owned':
+                result['owned_sessions'] = owned_sessions_with_stats(sessions)
+            else:
+                result[f'{list_name}_sessions'] = [s.to_dict() for s in sessions]
+            result['next_cursors'][list_name] = next_cursor
+
+        return add_etag(jsonify(result), etag), 200
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @auth_bp.route('/invite-to-session', methods=['POST'])
 def invite_to_session():
-    user_id = session.get('user_id')
+    user_id = get_current_user_id()
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
 
@@ -227,7 +384,7 @@ def invite_to_session():
             # Get mail instance from current app
             mail = current_app.extensions.get('mail')
             if mail:
-                inviter = User.query.get(user_id)
+                inviter = get_current_user()
                 session_details = {
                     'jira_url': voting_session.jira_url,
                     'jira_query': voting_session.jira_query
@@ -240,7 +397,9 @@ def invite_to_session():
                     session_id,
                     session_details
                 )
+                db.session.commit()  # Queues the email when the mail queue is running
         except Exception as e:
+            db.session.rollback()
             # Log error but don't fail invitation
             current_app.logger.error(f"Failed to send invitation email to {invitee.email}: {str(e)}")
 
@@ -255,7 +414,7 @@ def invite_to_session():
 
 @auth_bp.route('/invite-team-to-session', methods=['POST'])
 def invite_team_to_session():
-    user_id = session.get('user_id')
+    user_id = get_current_user_id()
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
 
@@ -298,12 +457,14 @@ def invite_team_to_session():
         errors = []
 
         # Get inviter info for emails
-        inviter = User.query.get(user_id)
+        inviter = get_current_user()
         session_details = {
             'jira_url': voting_session.jira_url,
             'jira_query': voting_session.jira_query
         }
 
+        invited_members = []
+
         for member in team_members:
             # Skip if member is already invited
             existing_invitation = SessionInvitation.query.filter_by(
@@ -324,34 +485,39 @@ def invite_team_to_session():
                 )
                 db.session.add(invitation)
                 invited_count += 1
-
-                # Send invitation email (non-blocking)
-                try:
-                    mail = current_app.extensions.get('mail')
-                    if mail:
-                        send_session_invitation_email(
-                            mail,
-                            member.email,
-                            member.username,
-                            inviter.username,
-                            session_id,
-                            session_details
-                        )
-                except Exception as email_error:
-                    current_app.logger.error(f"Failed to send invitation email to {member.email}: {str(email_error)}")
+                invited_members.append(member)
 
             except Exception as e:
                 errors.append(f"Failed to invite {member.username}: {str(e)}")
 
         db.session.commit()
 
+        # Send all invitation emails together over shared SMTP connections
+        email_failures = []
+        try:
+            mail = current_app.extensions.get('mail')
+            if mail:
+                email_failures = send_session_invitation_emails(
+                    mail,
+                    [(member.email, member.username) for member in invited_members],
+                    inviter.username,
+                    session_id,
+                    session_details
+                )
+                db.session.commit()  # Queues the emails when the mail queue is running
+        except Exception as email_error:
+            db.session.rollback()
+            current_app.logger.error(f"Failed to send team invitation emails: {str(email_error)}")
+            email_failures = [{'email': member.email, 'error': str(email_error)} for member in invited_members]
+
         return jsonify({
             'message': f'Team invitation completed',
             'team_name': team.name,
             'invited_count': invited_count,
             'already_invited_count': already_invited_count,
             'total_members': len(team_members),
-            'errors': errors
+            'errors': errors,
+            'email_failures': email_failures
         }), 201
 
     except Exception as e:
@@ -360,7 +526,7 @@ def invite_team_to_session():
 
 @auth_bp.route('/respond-to-invitation', methods=['POST'])
 def respond_to_invitation():
-    user_id = session.get('user_id')
+    user_id = get_current_user_id()
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
 
@@ -397,12 +563,12 @@ def respond_to_invitation():
 @auth_bp.route('/jira-settings', methods=['GET'])
 def get_jira_settings():
     """Get user's saved Jira settings"""
-    user_id = session.get('user_id')
+    user_id = get_current_user_id()
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
 
     try:
-        user = User.query.get(user_id)
+        user = get_current_user()
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
@@ -417,7 +583,7 @@ def get_jira_settings():
 @auth_bp.route('/jira-settings', methods=['POST'])
 def save_jira_settings():
     """Save user's Jira settings"""
-    user_id = session.get('user_id')
+    user_id = get_current_user_id()
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
 
@@ -430,7 +596,7 @@ def save_jira_settings():
         if jira_url and not jira_url.startswith(('http://', 'https://')):
             return jsonify({'error': 'Invalid Jira URL format'}), 400
 
-        user = User.query.get(user_id)
+        user = get_current_user()
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
@@ -453,12 +619,12 @@ def save_jira_settings():
 @auth_bp.route('/jira-settings', methods=['DELETE'])
 def clear_jira_settings():
     """Clear user's saved Jira settings"""
-    user_id = session.get('user_id')
+    user_id = get_current_user_id()
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
 
     try:
-        user = User.query.get(user_id)
+        user = get_current_user()
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
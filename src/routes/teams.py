@@ -1,12 +1,13 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify
 from src.models.user import db, User
 from src.models.team import Team, TeamMembership
+from src.services.auth_resolver import get_current_user, get_current_user_id
 
 teams_bp = Blueprint('teams', __name__)
 
 @teams_bp.route('/create', methods=['POST'])
 def create_team():
-    user_id = session.get('user_id')
+    user_id = get_current_user_id()
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
 
@@ -60,12 +61,12 @@ def create_team():
 
 @teams_bp.route('/my-teams', methods=['GET'])
 def get_my_teams():
-    user_id = session.get('user_id')
+    user_id = get_current_user_id()
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
 
     try:
-        user = User.query.get(user_id)
+        user = get_current_user()
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
@@ -82,7 +83,7 @@ def get_my_teams():
 
 @teams_bp.route('/<int:team_id>', methods=['GET'])
 def get_team(team_id):
-    user_id = session.get('user_id')
+    user_id = get_current_user_id()
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
 
@@ -104,7 +105,7 @@ def get_team(team_id):
 
 @teams_bp.route('/<int:team_id>/add-member', methods=['POST'])
 def add_team_member(team_id):
-    user_id = session.get('user_id')
+    user_id = get_current_user_id()
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
 
@@ -153,7 +154,7 @@ def add_team_member(team_id):
 
 @teams_bp.route('/<int:team_id>/remove-member', methods=['POST'])
 def remove_team_member(team_id):
-    user_id = session.get('user_id')
+    user_id = get_current_user_id()
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
 
@@ -200,7 +201,7 @@ def remove_team_member(team_id):
 
 @teams_bp.route('/<int:team_id>/update', methods=['PUT'])
 def update_team(team_id):
-    user_id = session.get('user_id')
+    user_id = get_current_user_id()
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
 
@@ -252,7 +253,7 @@ def update_team(team_id):
 
 @teams_bp.route('/<int:team_id>/delete', methods=['DELETE'])
 def delete_team(team_id):
-    user_id = session.get('user_id')
+    user_id = get_current_user_id()
     if not user_id:
         return jsonify({'error': 'Not authenticated'}), 401
 
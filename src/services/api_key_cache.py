@@ -0,0 +1,137 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from sqlalchemy import bindparam
+from src.models.user import db
+from src.models.api_key import ApiKey
+
+# Defaults used when the app config does not override them
+DEFAULT_TTL = 60  # Seconds a verified key is trusted before it is looked up again
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_USAGE_FLUSH_INTERVAL = 5  # Seconds between batched last_used_at writes
+
+class ApiKeyCache:
+    """Remembers verified API keys and batches their last_used_at writes
+
+    Maps the SHA-256 hash of a verified key to its VerifiedApiKey (ID, owner,
+    scopes, expiry), so repeat requests are authenticated without touching
+    the database until the entry is TTL seconds old; hits do not extend it.
+    Revoking or deleting a key drops it immediately in this process; other
+    worker processes notice within the TTL. last_used_at is collected in memory and written for all keys used
+    since the previous flush in one statement by a background thread.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.ttl = DEFAULT_TTL
+        self.max_entries = DEFAULT_MAX_ENTRIES
+        self.flush_interval = DEFAULT_USAGE_FLUSH_INTERVAL
+        self._entries = OrderedDict()  # key hash -> (VerifiedApiKey, cached at)
+        self._hashes_by_id = {}  # api key id -> key hash
+        self._last_used = {}  # api key id -> latest use not yet written
+        self._lock = threading.Lock()
+        self._flusher = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.ttl = app.config.get('API_KEY_CACHE_TTL', DEFAULT_TTL)
+        self.max_entries = app.config.get('API_KEY_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)
+        self.flush_interval = app.config.get('API_KEY_USAGE_FLUSH_INTERVAL', DEFAULT_USAGE_FLUSH_INTERVAL)
+        app.extensions['api_key_cache'] = self
+
+        if self.flush_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_periodically, name='api-key-usage-flusher', daemon=True)
+            self._flusher.start()
+
+    def get(self, key_hash):
+        """The cached, unexpired VerifiedApiKey with this hash, or None"""
+        with self._lock:
+            entry = self._entries.get(key_hash)
+            if entry is None:
+                return None
+
+            verified, cached_at = entry
+            if time.monotonic() - cached_at > self.ttl or verified.is_expired():
+                self._remove(key_hash)
+                return None
+
+            self._entries.move_to_end(key_hash)
+            return verified
+
+    def put(self, key_hash, verified):
+        """Remember a key that was just verified against the database"""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._remove(key_hash)
+            self._entries[key_hash] = (verified, time.monotonic())
+            self._hashes_by_id[verified.id] = key_hash
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, api_key_id):
+        """Forget a key, e.g. after it was revoked or deleted"""
+        with self._lock:
+            key_hash = self._hashes_by_id.get(api_key_id)
+            if key_hash is not None:
+                self._remove(key_hash)
+            self._last_used.pop(api_key_id, None)
+
+    def record_use(self, api_key_id):
+        """Note that a key was used; written by the next flush"""
+        now = datetime.utcnow()
+        if self._flusher is None:
+            # No background flusher (e.g. outside the app): write it now
+            db.session.execute(
+                ApiKey.__table__.update().where(ApiKey.__table__.c.id == api_key_id).values(last_used_at=now)
+            )
+            db.session.commit()
+            return
+        with self._lock:
+            self._last_used[api_key_id] = now
+
+    def flush(self):
+        """Write the pending last_used_at values in one batched UPDATE"""
+        with self._lock:
+            pending, self._last_used = self._last_used, {}
+        if not pending:
+            return 0
+
+        try:
+            db.session.execute(
+                ApiKey.__table__.update()
+                .where(ApiKey.__table__.c.id == bindparam('api_key_id'))
+                .values(last_used_at=bindparam('used_at')),
+                [{'api_key_id': api_key_id, 'used_at': used_at} for api_key_id, used_at in pending.items()]
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            # Put the values back unless a newer use was recorded meanwhile
+            with self._lock:
+                for api_key_id, used_at in pending.items():
+                    self._last_used.setdefault(api_key_id, used_at)
+            raise
+        return len(pending)
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(self.flush_interval)
+            with self.app.app_context():
+                try:
+                    self.flush()
+                except Exception as e:
+                    self.app.logger.error(f"Failed to write API key last_used_at: {str(e)}")
+                finally:
+                    db.session.remove()
+
+    def _remove(self, key_hash):
+        # Caller holds the lock
+        entry = self._entries.pop(key_hash, None)
+        if entry is not None and self._hashes_by_id.get(entry[0].id) == key_hash:
+            del self._hashes_by_id[entry[0].id]
+
+api_key_cache = ApiKeyCache()
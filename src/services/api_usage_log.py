@@ -0,0 +1,187 @@
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from sqlalchemy import select, and_
+from src.models.user import db
+from src.models.api_key import ApiKeyUsage, ApiKeyUsageRollup, ApiKeyLatencyRollup
+
+# Defaults used when the app config does not override them
+DEFAULT_BUFFER_SIZE = 10000  # Usage events held in memory at most; the oldest are dropped beyond this
+DEFAULT_FLUSH_SIZE = 500  # Buffered events that trigger a write before the interval is up
+DEFAULT_FLUSH_INTERVAL = 2  # Seconds between writes
+DEFAULT_RETENTION_DAYS = 30  # Raw usage logs older than this are pruned; 0 keeps them forever
+DEFAULT_HOURLY_ROLLUP_RETENTION_DAYS = 90  # Daily rollups are kept forever
+DEFAULT_PRUNE_BATCH_SIZE = 1000  # Rows deleted per transaction, so pruning never holds the write lock for long
+
+# Seconds between retention runs
+PRUNE_INTERVAL = 3600
+
+class ApiUsageLog:
+    """Buffers API key usage events and writes them in bulk
+
+    Requests append an event to a bounded in-memory ring buffer and move
+    on. A background writer inserts everything buffered with one
+    executemany INSERT when FLUSH_SIZE events have piled up or the flush
+    interval has passed, and adds them to the hourly and daily rollups and
+    latency histograms in the same transaction. If the writer falls behind, the oldest events are
+    dropped and counted rather than letting memory grow. The writer also
+    prunes raw logs and hourly rollups past their retention period.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.buffer_size = DEFAULT_BUFFER_SIZE
+        self.flush_size = DEFAULT_FLUSH_SIZE
+        self.flush_interval = DEFAULT_FLUSH_INTERVAL
+        self.retention_days = DEFAULT_RETENTION_DAYS
+        self.hourly_rollup_retention_days = DEFAULT_HOURLY_ROLLUP_RETENTION_DAYS
+        self.prune_batch_size = DEFAULT_PRUNE_BATCH_SIZE
+        self._next_prune = 0.0
+        self._buffer = deque(maxlen=self.buffer_size)
+        self._lock = threading.Lock()
+        self._flush_requested = threading.Event()
+        self._writer = None
+        self.written = 0
+        self.dropped = 0  # Discarded because the buffer was full
+        self.failed = 0  # Lost because the insert failed
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.buffer_size = app.config.get('API_USAGE_BUFFER_SIZE', DEFAULT_BUFFER_SIZE)
+        self.flush_size = app.config.get('API_USAGE_FLUSH_SIZE', DEFAULT_FLUSH_SIZE)
+        self.flush_interval = app.config.get('API_USAGE_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+        self.retention_days = app.config.get('API_USAGE_RETENTION_DAYS', DEFAULT_RETENTION_DAYS)
+        self.hourly_rollup_retention_days = app.config.get(
+            'API_USAGE_HOURLY_ROLLUP_RETENTION_DAYS', DEFAULT_HOURLY_ROLLUP_RETENTION_DAYS
+        )
+        self.prune_batch_size = app.config.get('API_USAGE_PRUNE_BATCH_SIZE', DEFAULT_PRUNE_BATCH_SIZE)
+        with self._lock:
+            self._buffer = deque(self._buffer, maxlen=self.buffer_size)
+        app.extensions['api_usage_log'] = self
+
+        self._writer = threading.Thread(target=self._write_periodically, name='api-usage-writer', daemon=True)
+        self._writer.start()
+
+    def record(self, api_key_id, endpoint, method, ip_address=None, user_agent=None, status_code=None,
+               response_size=None, latency_ms=None):
+        """Buffer one usage event; written to api_key_usage by the background writer"""
+        event = {
+            'api_key_id': api_key_id,
+            'endpoint': endpoint,
+            'method': method,
+            'status_code': status_code,
+            'ip_address': ip_address,
+            'user_agent': user_agent,
+            'response_size': response_size,
+            'latency_ms': latency_ms,
+            'timestamp': datetime.utcnow()
+        }
+        if self._writer is None:
+            # No background writer (e.g. outside the app): write it now
+            self._insert([event])
+            return
+
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+            self._buffer.append(event)
+            buffered = len(self._buffer)
+        if buffered >= self.flush_size:
+            self._flush_requested.set()
+
+    def discard(self, api_key_id):
+        """Drop buffered events of a key, e.g. because it was deleted"""
+        with self._lock:
+            self._buffer = deque(
+                (event for event in self._buffer if event['api_key_id'] != api_key_id),
+                maxlen=self._buffer.maxlen
+            )
+
+    def flush(self):
+        """Insert everything buffered so far; returns the number of events written"""
+        with self._lock:
+            events = list(self._buffer)
+            self._buffer.clear()
+        if not events:
+            return 0
+
+        try:
+            self._insert(events)
+        except Exception:
+            with self._lock:
+                self.failed += len(events)
+            raise
+
+        with self._lock:
+            self.written += len(events)
+        return len(events)
+
+    def prune(self):
+        """Delete raw logs and hourly rollups and histograms past their retention; returns the rows deleted"""
+        now = datetime.utcnow()
+        deleted = 0
+        if self.retention_days > 0:
+            usage = ApiKeyUsage.__table__
+            deleted += self._delete_in_batches(usage, usage.c.timestamp < now - timedelta(days=self.retention_days))
+        if self.hourly_rollup_retention_days > 0:
+            for rollups in (ApiKeyUsageRollup.__table__, ApiKeyLatencyRollup.__table__):
+                deleted += self._delete_in_batches(rollups, and_(
+                    rollups.c.period == 'hour',
+                    rollups.c.period_start < now - timedelta(days=self.hourly_rollup_retention_days)
+                ))
+        return deleted
+
+    def _delete_in_batches(self, table, condition):
+        deleted = 0
+        while True:
+            batch = select(table.c.id).where(condition).order_by(table.c.id).limit(self.prune_batch_size)
+            result = db.session.execute(table.delete().where(table.c.id.in_(batch)))
+            db.session.commit()
+            deleted += result.rowcount
+            if result.rowcount < self.prune_batch_size:
+                return deleted
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'buffered': len(self._buffer),
+                'buffer_size': self._buffer.maxlen,
+                'written': self.written,
+                'dropped': self.dropped,
+                'failed': self.failed
+            }
+
+    def _insert(self, events):
+        try:
+            db.session.execute(ApiKeyUsage.__table__.insert(), events)
+            ApiKeyUsageRollup.add_usage(db.session, events)
+            ApiKeyLatencyRollup.add_latencies(db.session, events)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def _write_periodically(self):
+        while True:
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            with self.app.app_context():
+                try:
+                    self.flush()
+                except Exception as e:
+                    self.app.logger.error(f"Failed to write API key usage logs: {str(e)}")
+
+                if time.monotonic() >= self._next_prune:
+                    self._next_prune = time.monotonic() + PRUNE_INTERVAL
+                    try:
+                        self.prune()
+                    except Exception as e:
+                        db.session.rollback()
+                        self.app.logger.error(f"Failed to prune API key usage logs: {str(e)}")
+
+                db.session.remove()
+
+api_usage_log = ApiUsageLog()
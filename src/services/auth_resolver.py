@@ -0,0 +1,157 @@
+import time
+from flask import request, session, g, jsonify, current_app, after_this_request
+from src.models.user import db, User
+from src.models.api_key import ApiKey
+from src.services.api_usage_log import api_usage_log
+
+# Blueprints whose API key access is controlled by API_KEY_ENDPOINTS. Requests with an
+# API key to any other of their endpoints are rejected; account, login and Jira credential
+# endpoints stay session-only.
+API_KEY_BLUEPRINTS = ('jira', 'auth', 'teams')
+
+# Endpoints that accept an API key in place of the session cookie -> scope the key needs.
+# Keys with the write scope may also read; the admin scope grants everything.
+API_KEY_ENDPOINTS = {
+    'jira.create_session': 'write',
+    'jira.get_session': 'read',
+    'jira.session_event_stream': 'read',
+    'jira.submit_vote': 'write',
+    'jira.close_session': 'write',
+    'jira.get_jira_rate_limits': 'read',
+    'jira.get_session_cache_stats': 'read',
+    'jira.get_job': 'read',
+    'jira.delete_session': 'admin',
+    'jira.remove_issue': 'write',
+    'jira.push_story_points': 'write',
+    'jira.refresh_session': 'write',
+    'jira.refresh_task': 'write',
+    'jira.refresh_tasks': 'write',
+    'auth.current_user': 'read',
+    'auth.user_sessions': 'read',
+    'teams.get_my_teams': 'read',
+    'teams.get_team': 'read',
+}
+
+# Scopes that satisfy each required scope
+ACCEPTED_SCOPES = {
+    'read': ['read', 'write'],
+    'write': ['write'],
+    'admin': ['admin'],
+}
+
+class Principal:
+    """Who is making the request: a logged-in user, or the owner of an API key"""
+
+    def __init__(self, user_id, api_key=None, user=None):
+        self.user_id = user_id
+        self.api_key = api_key  # VerifiedApiKey; None for session cookie logins
+        self._user = user
+
+    @property
+    def user(self):
+        """The User, loaded on first use"""
+        if self._user is None:
+            self._user = db.session.get(User, self.user_id)
+        return self._user
+
+def init_app(app):
+    app.before_request(authenticate_api_key)
+
+def get_request_api_key():
+    """The API key sent in X-API-Key or as an Authorization Bearer token, if any
+
+    Other Authorization schemes (e.g. Basic credentials for a proxy in front
+    of the app) are not API keys and are ignored.
+    """
+    api_key = request.headers.get('X-API-Key')
+    if api_key:
+        return api_key
+    authorization = request.headers.get('Authorization', '')
+    if authorization.startswith('Bearer '):
+        return authorization[len('Bearer '):].strip() or None
+    return None
+
+def accepts_api_key():
+    """Whether the current endpoint may be authenticated with an API key
+
+    Endpoints outside API_KEY_BLUEPRINTS check keys with their own
+    decorators (see api_key_auth_required).
+    """
+    if request.blueprint in API_KEY_BLUEPRINTS:
+        return request.endpoint in API_KEY_ENDPOINTS
+    return True
+
+def get_principal():
+    """The request's principal, resolved once per request and kept on flask.g. None if anonymous."""
+    if 'principal' not in g:
+        g.principal = resolve_principal()
+    return g.principal
+
+def get_current_user_id():
+    principal = get_principal()
+    return principal.user_id if principal else None
+
+def get_current_user():
+    principal = get_principal()
+    return principal.user if principal else None
+
+def resolve_principal():
+    """Authenticate by API key if one was sent to an endpoint that accepts it, otherwise by session cookie"""
+    started_at = time.perf_counter()
+    api_key = get_request_api_key() if accepts_api_key() else None
+    if api_key:
+        # Checks the key's owner is active too; cached keys need no query
+        verified = ApiKey.verify_key(api_key)
+        if not verified:
+            return None
+        log_api_key_usage(verified.id, started_at)
+        return Principal(verified.user_id, api_key=verified)
+
+    user_id = session.get('user_id')
+    if user_id:
+        return Principal(user_id)
+    return None
+
+def authenticate_api_key():
+    """Reject requests with a bad API key, or one the endpoint doesn't accept or lacking its scope
+
+    Runs before every request. Only applies to requests that send an API key
+    to a blueprint in API_KEY_BLUEPRINTS; the API key management endpoints
+    check keys themselves.
+    """
+    if request.blueprint not in API_KEY_BLUEPRINTS or not get_request_api_key():
+        return None
+
+    required_scope = API_KEY_ENDPOINTS.get(request.endpoint)
+    if required_scope is None:
+        return jsonify({'error': 'This endpoint does not accept API keys'}), 403
+
+    principal = get_principal()
+    if principal is None:
+        return jsonify({'error': 'Invalid or expired API key'}), 401
+
+    required_scopes = ACCEPTED_SCOPES[required_scope]
+    if not any(principal.api_key.has_scope(scope) for scope in required_scopes):
+        return jsonify({'error': f'Insufficient permissions. Required scopes: {", ".join(required_scopes)}'}), 403
+    return None
+
+def log_api_key_usage(api_key_id, started_at):
+    """Record this request in the key's usage log when its response is sent"""
+    @after_this_request
+    def record_usage(response):
+        try:
+            # Buffered and written in bulk in the background
+            api_usage_log.record(
+                api_key_id,
+                endpoint=request.endpoint or request.path,
+                method=request.method,
+                ip_address=request.remote_addr,
+                user_agent=request.headers.get('User-Agent', ''),
+                status_code=response.status_code,
+                response_size=response.calculate_content_length(),
+                latency_ms=round((time.perf_counter() - started_at) * 1000, 3)
+            )
+        except Exception as e:
+            # Don't fail the request if logging fails
+            current_app.logger.error(f"Failed to log API key usage: {e}")
+        return response
@@ -2,38 +2,95 @@ from flask_mail import Message
 from flask import current_app
 from datetime import datetime
 import os
+from src.services.mail_queue import DEFAULT_BATCH_SIZE, MESSAGE_ERRORS
+
+def build_email_message(subject, recipients, html_body, text_body=None):
+    """Build a message from the configured sender; raises ValueError if it can't be sent"""
+    # Get sender from config with fallback
+    sender = current_app.config.get('MAIL_DEFAULT_SENDER') or current_app.config.get('MAIL_USERNAME')
+    if not sender:
+        raise ValueError("No sender configured - MAIL_DEFAULT_SENDER or MAIL_USERNAME required")
+
+    # Validate that sender is not the same as recipient
+    if isinstance(recipients, list) and len(recipients) > 0:
+        if sender == recipients[0]:
+            raise ValueError(f"Sender and recipient are the same: {sender}")
+
+    msg = Message(
+        subject=subject,
+        sender=sender,
+        recipients=recipients
+    )
+    msg.html = html_body
+    if text_body:
+        msg.body = text_body
+    return msg
 
 def send_email(mail, subject, recipients, html_body, text_body=None):
     """Send an email using Flask-Mail"""
     try:
-        # Get sender from config with fallback
-        sender = current_app.config.get('MAIL_DEFAULT_SENDER') or current_app.config.get('MAIL_USERNAME')
-        if not sender:
-            current_app.logger.error("No sender configured - MAIL_DEFAULT_SENDER or MAIL_USERNAME required")
-            return False
-
-        # Validate that sender is not the same as recipient
-        if isinstance(recipients, list) and len(recipients) > 0:
-            if sender == recipients[0]:
-                current_app.logger.error(f"Sender and recipient are the same: {sender}")
-                return False
-
-        msg = Message(
-            subject=subject,
-            sender=sender,
-            recipients=recipients
-        )
-        msg.html = html_body
-        if text_body:
-            msg.body = text_body
-
-        current_app.logger.info(f"Sending email from {sender} to {recipients} with subject: {subject}")
+        msg = build_email_message(subject, recipients, html_body, text_body)
+
+        # Hand the message to the background senders when the mail queue is running
+        mail_queue = current_app.extensions.get('mail_queue')
+        if mail_queue:
+            current_app.logger.info(f"Queueing email from {msg.sender} to {recipients} with subject: {subject}")
+            mail_queue.enqueue(msg)
+            return True
+
+        current_app.logger.info(f"Sending email from {msg.sender} to {recipients} with subject: {subject}")
         mail.send(msg)
         return True
+    except ValueError as e:
+        current_app.logger.error(str(e))
+        return False
     except Exception as e:
         current_app.logger.error(f"Failed to send email: {str(e)}")
         return False
 
+def send_bulk_email(mail, messages):
+    """Send many messages over as few SMTP connections as possible
+
+    Messages are sent in batches of MAIL_BATCH_SIZE, each batch over one
+    connection. When the mail queue is running they are added to the
+    current transaction instead (the caller commits), and the queue's
+    senders batch them the same way.
+    Returns a list of (message, error) for the messages that failed.
+    """
+    failures = []
+    if not messages:
+        return failures
+
+    mail_queue = current_app.extensions.get('mail_queue')
+    if mail_queue:
+        try:
+            mail_queue.enqueue_many(messages)
+        except Exception as e:
+            current_app.logger.error(f"Failed to queue {len(messages)} emails: {str(e)}")
+            failures.extend((message, str(e)) for message in messages)
+        return failures
+
+    batch_size = current_app.config.get('MAIL_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+    for batch_start in range(0, len(messages), batch_size):
+        batch = messages[batch_start:batch_start + batch_size]
+        sent_count = 0
+        try:
+            with mail.connect() as connection:
+                for message in batch:
+                    try:
+                        connection.send(message)
+                    except MESSAGE_ERRORS as e:
+                        # The server rejected this message; the connection can still send the rest
+                        current_app.logger.error(f"Failed to send email to {message.recipients}: {str(e)}")
+                        failures.append((message, str(e)))
+                    sent_count += 1
+        except Exception as e:
+            # Connecting failed or the connection dropped: the rest of the batch was not sent
+            current_app.logger.error(f"Failed to send email batch: {str(e)}")
+            failures.extend((message, str(e)) for message in batch[sent_count:])
+
+    return failures
+
 def get_email_template_base():
     """Get the base HTML template for emails"""
     return """
@@ -274,8 +331,8 @@ def send_welcome_email(mail, user_email, username):
         text_body=text_body
     )
 
-def send_session_invitation_email(mail, invitee_email, invitee_username, inviter_username, session_id, session_details):
-    """Send session invitation email"""
+def render_session_invitation_email(invitee_username, inviter_username, session_id, session_details):
+    """Subject and bodies of a session invitation email, as keyword arguments for send_email"""
     base_url = current_app.config.get('APP_BASE_URL', 'http://localhost:8080')
     session_url = f"{base_url}/join/{session_id}"
 
@@ -350,13 +407,35 @@ def send_session_invitation_email(mail, invitee_email, invitee_username, inviter
     Happy estimating!
     """
 
-    return send_email(
-        mail=mail,
-        subject=f"🎯 Estimation Session Invitation from {inviter_username}",
-        recipients=[invitee_email],
-        html_body=html_body,
-        text_body=text_body
-    )
+    return {
+        'subject': f"🎯 Estimation Session Invitation from {inviter_username}",
+        'html_body': html_body,
+        'text_body': text_body
+    }
+
+def send_session_invitation_email(mail, invitee_email, invitee_username, inviter_username, session_id, session_details):
+    """Send session invitation email"""
+    email = render_session_invitation_email(invitee_username, inviter_username, session_id, session_details)
+    return send_email(mail=mail, recipients=[invitee_email], **email)
+
+def send_session_invitation_emails(mail, invitees, inviter_username, session_id, session_details):
+    """Send invitation emails to several users over shared SMTP connections
+
+    `invitees` is a list of (email, username) pairs. Returns a list of
+    {'email', 'error'} dicts for the invitees whose email failed.
+    """
+    messages = []
+    failures = []
+    for invitee_email, invitee_username in invitees:
+        email = render_session_invitation_email(invitee_username, inviter_username, session_id, session_details)
+        try:
+            messages.append(build_email_message(recipients=[invitee_email], **email))
+        except ValueError as e:
+            failures.append({'email': invitee_email, 'error': str(e)})
+
+    for message, error in send_bulk_email(mail, messages):
+        failures.append({'email': message.recipients[0], 'error': error})
+    return failures
 
 def send_first_vote_notification_email(mail, creator_email, creator_username, voter_name, session_id, issue_key, estimation, session_details):
     """Send notification to session creator when someone votes for the first time"""
@@ -0,0 +1,19 @@
+import hashlib
+from flask import request, current_app
+
+def make_etag(*parts):
+    """Strong ETag value built from values that change whenever the response does"""
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+def not_modified(etag):
+    """A 304 response if the client already has this ETag, otherwise None"""
+    if etag in request.if_none_match:
+        response = current_app.response_class(status=304)
+        return add_etag(response, etag)
+    return None
+
+def add_etag(response, etag):
+    """Attach the ETag and ask clients to revalidate before reusing the response"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
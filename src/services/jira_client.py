@@ -0,0 +1,225 @@
+import random
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import requests
+from requests.adapters import HTTPAdapter
+from flask import current_app, has_app_context
+from src.services.rate_limiter import get_rate_limiter
+
+# Defaults used when the app config does not override them
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 30
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_BASE_DELAY = 0.5
+DEFAULT_RETRY_MAX_DELAY = 30
+DEFAULT_RETRY_DEADLINE = 60
+
+# Maximum number of Jira clients (one per base URL and token) kept alive at once
+MAX_CLIENTS = 32
+
+class RetryPolicy:
+    """Retry rules shared by every Jira call
+
+    Retries transient failures (connection errors, timeouts, 408/429/5xx
+    gateway errors) with exponential backoff and full jitter, honours the
+    Retry-After header on 429/503, fails fast on other 4xx responses and
+    gives up once the overall deadline would be exceeded.
+    """
+
+    RETRYABLE_STATUS_CODES = frozenset([408, 429, 500, 502, 503, 504])
+
+    # Statuses that guarantee a request was not processed, so even POSTs can be retried
+    REJECTED_STATUS_CODES = frozenset([429, 503])
+
+    IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+    def __init__(self, max_retries=DEFAULT_MAX_RETRIES, base_delay=DEFAULT_RETRY_BASE_DELAY,
+                 max_delay=DEFAULT_RETRY_MAX_DELAY, deadline=DEFAULT_RETRY_DEADLINE, jitter=True):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline  # Seconds for all attempts together; None for no limit
+        self.jitter = jitter
+
+    def replace(self, **changes):
+        """Copy of this policy with some settings changed"""
+        settings = {
+            'max_retries': self.max_retries,
+            'base_delay': self.base_delay,
+            'max_delay': self.max_delay,
+            'deadline': self.deadline,
+            'jitter': self.jitter
+        }
+        settings.update(changes)
+        return RetryPolicy(**settings)
+
+    def should_retry_response(self, method, response):
+        if method.upper() in self.IDEMPOTENT_METHODS:
+            return response.status_code in self.RETRYABLE_STATUS_CODES
+        return response.status_code in self.REJECTED_STATUS_CODES
+
+    def should_retry_exception(self, method, exc):
+        if method.upper() in self.IDEMPOTENT_METHODS:
+            return isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+        # The request may already have been processed unless the connection never opened
+        return isinstance(exc, requests.exceptions.ConnectTimeout)
+
+    def get_delay(self, attempt, response=None):
+        """Seconds to wait before retry number `attempt` (0-based)"""
+        if response is not None and response.status_code in self.REJECTED_STATUS_CODES:
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return retry_after
+
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+def parse_retry_after(value):
+    """Parse a Retry-After header (seconds or HTTP date) into seconds, or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class JiraClient:
+    """HTTP client for one Jira base URL and token
+
+    Wraps a requests.Session with a keep-alive connection pool, so repeated
+    calls (including calls from worker threads) reuse TCP/TLS connections
+    instead of opening a new one per request. Every call gets a timeout
+    and goes through the shared per-host rate limiter.
+    """
+
+    def __init__(self, jira_url, token, pool_size=DEFAULT_POOL_SIZE,
+                 connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 retry_policy=None, rate_limiter=None):
+        self.base_url = jira_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Authorization': f'Bearer {token}',
+            'Accept': 'application/json',
+            'Content-Type': 'application/json'
+        })
+
+        # Block instead of opening throwaway connections when all pooled ones are busy
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def url(self, path):
+        """Build an absolute URL for a Jira REST path"""
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(self, method, path, retry_policy=None, **kwargs):
+        """Send a request to Jira using the pooled session
+
+        Every attempt first waits for the per-host rate limiter. Transient
+        failures are retried according to the retry policy. The last
+        response is returned as-is, so callers still decide how to handle
+        error statuses (e.g. with raise_for_status()).
+        """
+        policy = retry_policy or self.retry_policy
+        kwargs.setdefault('timeout', self.timeout)
+        url = self.url(path)
+        deadline = time.monotonic() + policy.deadline if policy.deadline else None
+
+        attempt = 0
+        while True:
+            response = None
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(self.base_url)
+            try:
+                response = self.session.request(method, url, **kwargs)
+                if not policy.should_retry_response(method, response):
+                    return response
+            except requests.exceptions.RequestException as e:
+                if not policy.should_retry_exception(method, e) or attempt >= policy.max_retries:
+                    raise
+
+            if attempt >= policy.max_retries:
+                return response
+
+            delay = policy.get_delay(attempt, response)
+            if deadline is not None and time.monotonic() + delay > deadline:
+                if response is None:
+                    raise requests.exceptions.RetryError(f'Retry deadline exceeded for {method} {url}')
+                return response
+
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request('PUT', path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+_clients = OrderedDict()
+_clients_lock = threading.Lock()
+
+def get_jira_client(jira_url, token):
+    """Get the shared Jira client for a base URL and token, creating it if needed"""
+    key = (jira_url.rstrip('/'), token)
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is not None:
+            _clients.move_to_end(key)
+            return client
+
+        config = current_app.config if has_app_context() else {}
+        client = JiraClient(
+            jira_url,
+            token,
+            pool_size=config.get('JIRA_POOL_SIZE', DEFAULT_POOL_SIZE),
+            connect_timeout=config.get('JIRA_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT),
+            read_timeout=config.get('JIRA_READ_TIMEOUT', DEFAULT_READ_TIMEOUT),
+            retry_policy=RetryPolicy(
+                max_retries=config.get('JIRA_MAX_RETRIES', DEFAULT_MAX_RETRIES),
+                base_delay=config.get('JIRA_RETRY_BASE_DELAY', DEFAULT_RETRY_BASE_DELAY),
+                max_delay=config.get('JIRA_RETRY_MAX_DELAY', DEFAULT_RETRY_MAX_DELAY),
+                deadline=config.get('JIRA_RETRY_DEADLINE', DEFAULT_RETRY_DEADLINE)
+            ),
+            rate_limiter=get_rate_limiter()
+        )
+        _clients[key] = client
+
+        # Drop the least recently used clients (e.g. tokens of long-closed sessions)
+        while len(_clients) > MAX_CLIENTS:
+            _, evicted = _clients.popitem(last=False)
+            evicted.close()
+
+        return client
+
+def close_jira_clients():
+    """Close all pooled Jira connections"""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
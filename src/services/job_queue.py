@@ -0,0 +1,208 @@
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import and_, func
+from sqlalchemy.exc import IntegrityError
+from src.models.user import db
+from src.models.job import Job
+
+# Defaults used when the app config does not override them
+DEFAULT_WORKERS = 2
+
+# Running jobs that have shown no sign of life for this long are assumed to belong to a dead worker and are requeued
+STALE_JOB_AGE = timedelta(minutes=15)
+
+# Seconds between checks for stale jobs
+STALE_SWEEP_INTERVAL = 60
+
+# Minimum seconds between progress writes, so per-item progress doesn't hammer the database
+PROGRESS_FLUSH_INTERVAL = 0.5
+
+class JobFailed(Exception):
+    """Raised by a job handler to mark the job failed while keeping a result"""
+
+    def __init__(self, message, result=None):
+        super().__init__(message)
+        self.result = result
+
+class DuplicateJob(Exception):
+    """Raised by enqueue when the session already has a queued or running job of that type"""
+
+class JobQueue:
+    """Durable background job queue backed by the jobs table
+
+    Jobs are stored in the database and executed by an in-process worker
+    pool. Workers claim a job with a conditional UPDATE, so a job is only
+    ever run once even when several processes share the database. Running
+    jobs record a heartbeat; a background sweep requeues jobs whose
+    worker went quiet.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.executor = None
+        self.handlers = {}
+        self._sweeper = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.executor = ThreadPoolExecutor(
+            max_workers=app.config.get('JOB_WORKERS', DEFAULT_WORKERS),
+            thread_name_prefix='job-worker'
+        )
+        app.extensions['job_queue'] = self
+
+        # Pick up jobs left behind by a previous run
+        with app.app_context():
+            self.requeue_stale()
+            for job in Job.query.filter_by(status='queued').order_by(Job.created_at).all():
+                self.executor.submit(self._run, job.id)
+
+        self._sweeper = threading.Thread(target=self._sweep_periodically, name='job-sweeper', daemon=True)
+        self._sweeper.start()
+
+    def handler(self, job_type):
+        """Decorator registering the function that runs jobs of `job_type`
+
+        The handler is called as handler(job, report_progress) inside an app
+        context and returns the JSON-serializable job result.
+        """
+        def decorator(f):
+            self.handlers[job_type] = f
+            return f
+        return decorator
+
+    def enqueue(self, job_type, payload=None, session_id=None):
+        """Store a new job and hand it to the worker pool
+
+        Raises DuplicateJob if the session already has a queued or running
+        job of this type.
+        """
+        job = Job(
+            id=str(uuid.uuid4()),
+            job_type=job_type,
+            session_id=session_id,
+            status='queued',
+            payload=json.dumps(payload or {})
+        )
+        db.session.add(job)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            raise DuplicateJob(f'A {job_type} job is already queued or running for session {session_id}')
+
+        self.executor.submit(self._run, job.id)
+        return job
+
+    def requeue_stale(self):
+        """Requeue running jobs whose worker has gone quiet; returns their IDs"""
+        stale = and_(
+            Job.status == 'running',
+            func.coalesce(Job.heartbeat_at, Job.started_at) < datetime.utcnow() - STALE_JOB_AGE
+        )
+        stale_ids = [job_id for (job_id,) in db.session.query(Job.id).filter(stale)]
+        requeued = []
+        for job_id in stale_ids:
+            # The worker may have finished or reported progress since the SELECT
+            if Job.query.filter(Job.id == job_id, stale).update(
+                {'status': 'queued', 'started_at': None, 'heartbeat_at': None}, synchronize_session=False
+            ):
+                requeued.append(job_id)
+        db.session.commit()
+
+        for job_id in requeued:
+            self.app.logger.warning(f"Requeued job {job_id}: its worker stopped reporting")
+        return requeued
+
+    def _sweep_periodically(self):
+        while True:
+            time.sleep(STALE_SWEEP_INTERVAL)
+            with self.app.app_context():
+                try:
+                    for job_id in self.requeue_stale():
+                        self.executor.submit(self._run, job_id)
+                except Exception as e:
+                    db.session.rollback()
+                    self.app.logger.error(f"Failed to requeue stale jobs: {str(e)}")
+                finally:
+                    db.session.remove()
+
+    def _run(self, job_id):
+        with self.app.app_context():
+            try:
+                # Claim the job; another worker may have taken it already.
+                # A requeued job starts over, so progress from the earlier attempt is dropped.
+                now = datetime.utcnow()
+                claimed = Job.query.filter_by(id=job_id, status='queued').update(
+                    {
+                        'status': 'running',
+                        'started_at': now,
+                        'heartbeat_at': now,
+                        'progress_total': 0,
+                        'progress_completed': 0,
+                        'progress_results': None
+                    },
+                    synchronize_session=False
+                )
+                db.session.commit()
+                if not claimed:
+                    return
+
+                job = db.session.get(Job, job_id)
+                handler = self.handlers.get(job.job_type)
+                if handler is None:
+                    raise JobFailed(f'No handler registered for job type {job.job_type}')
+
+                progress = JobProgress(job)
+                result = handler(job, progress.report)
+                progress.flush()
+
+                job.status = 'succeeded'
+                job.result = json.dumps(result)
+            except JobFailed as e:
+                db.session.rollback()
+                job = db.session.get(Job, job_id)
+                job.status = 'failed'
+                job.error = str(e)
+                job.result = json.dumps(e.result) if e.result is not None else None
+            except Exception as e:
+                db.session.rollback()
+                self.app.logger.error(f"Job {job_id} failed: {str(e)}")
+                job = db.session.get(Job, job_id)
+                job.status = 'failed'
+                job.error = str(e)
+
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+
+class JobProgress:
+    """Collects per-item results reported by a handler and persists them periodically"""
+
+    def __init__(self, job):
+        self.job = job
+        self.results = []
+        self.last_flush = 0.0
+
+    def report(self, item_result, total=None):
+        if total is not None:
+            self.job.progress_total = total
+        if item_result is not None:
+            self.results.append(item_result)
+
+        if time.monotonic() - self.last_flush >= PROGRESS_FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        self.job.progress_completed = len(self.results)
+        self.job.progress_results = json.dumps(self.results)
+        self.job.heartbeat_at = datetime.utcnow()
+        db.session.commit()
+        self.last_flush = time.monotonic()
+
+job_queue = JobQueue()
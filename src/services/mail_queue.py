@@ -0,0 +1,208 @@
+import json
+import smtplib
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import and_, event
+from flask_mail import Message, BadHeaderError
+from src.models.user import db
+from src.models.outbound_email import OutboundEmail
+
+# Defaults used when the app config does not override them
+DEFAULT_WORKERS = 1
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_RETRY_BASE_DELAY = 30  # Seconds before the first retry; doubles with each attempt
+DEFAULT_RETRY_MAX_DELAY = 3600
+DEFAULT_POLL_INTERVAL = 5  # Seconds between checks for retries that have come due
+DEFAULT_BATCH_SIZE = 50  # Messages sent over one SMTP connection
+
+# How long a sender may hold a message. A message still 'sending' after this
+# belongs to a sender that died and is picked up again.
+SENDING_LEASE = timedelta(minutes=10)
+
+# Session.info flag marking a transaction that queued emails, so the senders are woken when it commits
+PENDING_FLAG = 'mail_queue_pending'
+
+# The server rejected one message but the connection can still be used for the next
+MESSAGE_ERRORS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPDataError,
+    BadHeaderError
+)
+
+class MailQueue:
+    """Durable outbound mail queue backed by the outbound_emails table
+
+    Requests add the message to their own transaction and return
+    immediately; it is queued only if that transaction commits, and the
+    senders are woken when it does. Background sender threads deliver due
+    messages over a single SMTP connection per batch and retry failures
+    with exponential backoff. Senders claim messages with a conditional
+    UPDATE, so several processes can share the table.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.mail = None
+        self.workers = DEFAULT_WORKERS
+        self.max_attempts = DEFAULT_MAX_ATTEMPTS
+        self.retry_base_delay = DEFAULT_RETRY_BASE_DELAY
+        self.retry_max_delay = DEFAULT_RETRY_MAX_DELAY
+        self.poll_interval = DEFAULT_POLL_INTERVAL
+        self.batch_size = DEFAULT_BATCH_SIZE
+        self._wakeup = threading.Event()
+        self._threads = []
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, mail=None):
+        """Start the sender threads. With MAIL_QUEUE_WORKERS=0 emails are sent during the request instead."""
+        self.app = app
+        self.mail = mail or app.extensions.get('mail')
+        self.workers = app.config.get('MAIL_QUEUE_WORKERS', DEFAULT_WORKERS)
+        self.max_attempts = app.config.get('MAIL_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)
+        self.retry_base_delay = app.config.get('MAIL_RETRY_BASE_DELAY', DEFAULT_RETRY_BASE_DELAY)
+        self.retry_max_delay = app.config.get('MAIL_RETRY_MAX_DELAY', DEFAULT_RETRY_MAX_DELAY)
+        self.poll_interval = app.config.get('MAIL_QUEUE_POLL_INTERVAL', DEFAULT_POLL_INTERVAL)
+        self.batch_size = app.config.get('MAIL_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+        if self.mail is None or self.workers <= 0:
+            return
+
+        app.extensions['mail_queue'] = self
+        if not event.contains(db.session, 'after_commit', self._wake_after_commit):
+            event.listen(db.session, 'after_commit', self._wake_after_commit)
+            event.listen(db.session, 'after_rollback', self._forget_pending)
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f'mail-sender-{number}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def enqueue(self, message):
+        """Add a Flask-Mail message to the current transaction; the caller's commit queues it"""
+        return self.enqueue_many([message])[0]
+
+    def enqueue_many(self, messages):
+        """Add several messages to the current transaction, so they are queued and go out together
+
+        Nothing is committed here: the messages become visible to the
+        senders with the caller's commit, and are dropped if it rolls back.
+        """
+        emails = [
+            OutboundEmail(
+                sender=message.sender,
+                recipients=json.dumps(list(message.recipients)),
+                subject=message.subject,
+                html_body=message.html,
+                text_body=message.body
+            )
+            for message in messages
+        ]
+        db.session.add_all(emails)
+        db.session.info[PENDING_FLAG] = True
+        return emails
+
+    def _wake_after_commit(self, session):
+        if session.info.pop(PENDING_FLAG, False):
+            self._wakeup.set()
+
+    def _forget_pending(self, session):
+        session.info.pop(PENDING_FLAG, None)
+
+    def retry_delay(self, attempts):
+        """Seconds to wait after the given number of failed attempts"""
+        return min(self.retry_max_delay, self.retry_base_delay * 2 ** (attempts - 1))
+
+    def _work(self):
+        while True:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            with self.app.app_context():
+                try:
+                    # Keep going while full batches come back, so a burst is drained without waiting
+                    while self._send_due() == self.batch_size:
+                        pass
+                except Exception as e:
+                    db.session.rollback()
+                    self.app.logger.error(f"Mail sender failed: {str(e)}")
+                finally:
+                    db.session.remove()
+
+    def _send_due(self):
+        """Send one batch of due messages; returns how many were claimed"""
+        emails = self._claim(self.batch_size)
+        if emails:
+            self._send(emails)
+        return len(emails)
+
+    def _claim(self, limit):
+        now = datetime.utcnow()
+        # Queued messages that are due, plus messages whose sender's lease ran out
+        due = and_(OutboundEmail.status.in_(('queued', 'sending')), OutboundEmail.next_attempt_at <= now)
+        candidate_ids = [
+            email_id for (email_id,) in db.session.query(OutboundEmail.id)
+            .filter(due)
+            .order_by(OutboundEmail.next_attempt_at, OutboundEmail.id)
+            .limit(limit)
+        ]
+
+        claimed_ids = []
+        for email_id in candidate_ids:
+            # Another sender may have claimed it since the SELECT
+            claimed = OutboundEmail.query.filter(OutboundEmail.id == email_id, due).update(
+                {'status': 'sending', 'next_attempt_at': now + SENDING_LEASE}, synchronize_session=False
+            )
+            if claimed:
+                claimed_ids.append(email_id)
+        db.session.commit()
+
+        if not claimed_ids:
+            return []
+        return OutboundEmail.query.filter(OutboundEmail.id.in_(claimed_ids)).order_by(OutboundEmail.id).all()
+
+    def _send(self, emails):
+        pending = list(emails)
+        try:
+            with self.mail.connect() as connection:
+                while pending:
+                    email = pending[0]
+                    try:
+                        connection.send(self._build_message(email))
+                    except MESSAGE_ERRORS as e:
+                        self._retry_later(email, e)
+                    else:
+                        email.status = 'sent'
+                        email.attempts += 1
+                        email.sent_at = datetime.utcnow()
+                        email.last_error = None
+                    pending.pop(0)
+                    # Commit each result so a crash mid-batch doesn't resend delivered messages
+                    db.session.commit()
+        except Exception as e:
+            # Connecting failed or the connection dropped: everything not yet sent is retried
+            for email in pending:
+                self._retry_later(email, e)
+            db.session.commit()
+
+    def _retry_later(self, email, error):
+        email.attempts += 1
+        email.last_error = str(error)
+        if email.attempts >= self.max_attempts:
+            email.status = 'failed'
+            self.app.logger.error(
+                f"Giving up on email {email.id} to {email.get_recipients()} after {email.attempts} attempts: {str(error)}"
+            )
+        else:
+            email.status = 'queued'
+            email.next_attempt_at = datetime.utcnow() + timedelta(seconds=self.retry_delay(email.attempts))
+            self.app.logger.warning(f"Failed to send email {email.id}, will retry: {str(error)}")
+
+    def _build_message(self, email):
+        return Message(
+            subject=email.subject,
+            sender=email.sender,
+            recipients=email.get_recipients(),
+            html=email.html_body,
+            body=email.text_body
+        )
+
+mail_queue = MailQueue()
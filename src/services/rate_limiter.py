@@ -0,0 +1,148 @@
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+from flask import current_app, has_app_context
+
+# Defaults used when the app config does not override them
+DEFAULT_RATE = 10.0  # Requests per second per Jira host
+DEFAULT_BURST = 10
+DEFAULT_BACKEND = 'memory'
+
+class MemoryBackend:
+    """Token buckets held in this process"""
+
+    def __init__(self):
+        self._buckets = {}  # key -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def reserve(self, key, rate, burst):
+        """Take one token and return how many seconds the caller must wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated_at = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate) - 1
+            self._buckets[key] = (tokens, now)
+        return max(0.0, -tokens / rate)
+
+class SQLiteBackend:
+    """Token buckets stored in a SQLite file, shared by every worker process
+
+    Each reservation runs in a BEGIN IMMEDIATE transaction, so the SQLite
+    file lock serializes bucket updates across processes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS rate_limit_buckets ('
+            'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)'
+        )
+
+    def _connection(self):
+        # sqlite3 connections can't be shared between threads, so keep one per thread
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def reserve(self, key, rate, burst):
+        """Take one token and return how many seconds the caller must wait before using it"""
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Wall-clock time, since monotonic clocks aren't comparable between processes
+            now = time.time()
+            row = conn.execute('SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?', (key,)).fetchone()
+            tokens, updated_at = row if row else (burst, now)
+            tokens = min(burst, tokens + max(0.0, now - updated_at) * rate) - 1
+            conn.execute(
+                'INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated_at) VALUES (?, ?, ?)',
+                (key, tokens, now)
+            )
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return max(0.0, -tokens / rate)
+
+class HostRateLimiter:
+    """Token-bucket rate limiter with one bucket per Jira host
+
+    Callers reserve a token before each request and sleep for as long as
+    the bucket is overdrawn. The time spent waiting is recorded per host.
+    """
+
+    def __init__(self, backend=None, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.backend = backend or MemoryBackend()
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._metrics = {}
+        self._metrics_lock = threading.Lock()
+
+    def acquire(self, url):
+        """Wait for permission to send one request to the host of `url`. Returns seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+
+        host = urlparse(url).netloc or url
+        wait_time = self.backend.reserve(host, self.rate, self.burst)
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+        self._record(host, wait_time)
+        return wait_time
+
+    def _record(self, host, wait_time):
+        with self._metrics_lock:
+            metrics = self._metrics.setdefault(host, {
+                'calls': 0,
+                'delayed_calls': 0,
+                'total_wait_seconds': 0.0,
+                'max_wait_seconds': 0.0
+            })
+            metrics['calls'] += 1
+            if wait_time > 0:
+                metrics['delayed_calls'] += 1
+                metrics['total_wait_seconds'] += wait_time
+                metrics['max_wait_seconds'] = max(metrics['max_wait_seconds'], wait_time)
+
+    def get_metrics(self):
+        """Per-host counts of limited calls and how long they waited (this process only)"""
+        with self._metrics_lock:
+            result = {}
+            for host, metrics in self._metrics.items():
+                result[host] = dict(metrics)
+                result[host]['total_wait_seconds'] = round(metrics['total_wait_seconds'], 3)
+                result[host]['max_wait_seconds'] = round(metrics['max_wait_seconds'], 3)
+                result[host]['average_wait_seconds'] = round(metrics['total_wait_seconds'] / metrics['calls'], 3)
+            return result
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+def get_rate_limiter():
+    """Get the process-wide Jira rate limiter, configured from the app config"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            config = current_app.config if has_app_context() else {}
+
+            backend = MemoryBackend()
+            if config.get('JIRA_RATE_LIMIT_BACKEND', DEFAULT_BACKEND) == 'sqlite':
+                backend = SQLiteBackend(config['JIRA_RATE_LIMIT_DB'])
+
+            _limiter = HostRateLimiter(
+                backend=backend,
+                rate=config.get('JIRA_RATE_LIMIT', DEFAULT_RATE),
+                burst=config.get('JIRA_RATE_BURST', DEFAULT_BURST)
+            )
+        return _limiter
@@ -0,0 +1,241 @@
+import json
+import threading
+from collections import OrderedDict
+from src.models.user import db
+from src.models.voting_session import VotingSession, JiraIssue, Vote, RemovedIssue
+
+# Defaults used when the app config does not override them
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+def estimate_size(value):
+    """Rough memory cost of a serializable value, measured as its JSON length"""
+    return len(json.dumps(value, default=str))
+
+class SessionSnapshot:
+    """Serialized state of one session: session dict, issues, votes and removals"""
+
+    def __init__(self, session_dict, creator_id, issues, votes, removed):
+        self.session = session_dict
+        self.creator_id = creator_id
+        self.version = session_dict['version']
+        self.issues = issues  # issue_key -> issue dict, in load order
+        self.votes = votes  # issue_key -> {vote id: vote dict}
+        self.removed = removed  # issue_key -> version of the removal
+        self.size = estimate_size([session_dict, issues, votes, removed])
+
+    @property
+    def last_synced_at(self):
+        return self.session['last_synced_at']
+
+class SessionCache:
+    """LRU cache of session snapshots, kept current by write-through
+
+    Endpoints that change a session update the cached snapshot in place
+    after committing, so reads of an active session are served without
+    loading its issues and votes. A change is only applied if it directly
+    follows the snapshot's version; if any version in between was missed
+    the snapshot is dropped instead. The cache is per process, so every hit
+    is also checked against the session's version and sync time (one
+    primary key lookup), and a snapshot another worker process has made
+    stale is reloaded.
+    """
+
+    def __init__(self, app=None):
+        self.max_bytes = DEFAULT_MAX_BYTES
+        self._snapshots = OrderedDict()
+        self._size = 0
+        self._writes = {}  # session_id -> write-through count, to detect writes during a load
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0  # Hits discarded because another process changed the session
+        self.evictions = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.max_bytes = app.config.get('SESSION_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+        app.extensions['session_cache'] = self
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def get(self, session_id):
+        """Snapshot of a session, loading it from the database on a miss. None if the session doesn't exist."""
+        with self._lock:
+            snapshot = self._snapshots.get(session_id)
+
+        if snapshot is not None:
+            current = self._current_state(session_id)
+            with self._lock:
+                if current == (snapshot.version, snapshot.last_synced_at):
+                    if self._snapshots.get(session_id) is snapshot:
+                        self._snapshots.move_to_end(session_id)
+                    self.hits += 1
+                    return snapshot
+                if self._snapshots.get(session_id) is snapshot:
+                    self._discard(session_id)
+                self.stale += 1
+            if current is None:
+                return None
+
+        with self._lock:
+            self.misses += 1
+            writes_before_load = self._writes.get(session_id, 0)
+
+        snapshot = self._load(session_id)
+        if snapshot is None:
+            return None
+
+        with self._lock:
+            # A write that landed while loading may be missing from the snapshot, so don't keep it
+            if self._writes.get(session_id, 0) == writes_before_load and snapshot.size <= self.max_bytes:
+                self._discard(session_id)
+                self._snapshots[session_id] = snapshot
+                self._size += snapshot.size
+                self._evict()
+        return snapshot
+
+    def _current_state(self, session_id):
+        """(version, last_synced_at) of the session as committed, or None if it doesn't exist"""
+        row = db.session.query(VotingSession.version, VotingSession.last_synced_at).filter_by(session_id=session_id).first()
+        if row is None:
+            return None
+        version, last_synced_at = row
+        return version, last_synced_at.isoformat() if last_synced_at else None
+
+    def _load(self, session_id):
+        voting_session = VotingSession.query.filter_by(session_id=session_id).first()
+        if not voting_session:
+            return None
+
+        issues = OrderedDict(
+            (issue.issue_key, issue.to_dict())
+            for issue in JiraIssue.query.filter_by(session_id=session_id).order_by(JiraIssue.id).all()
+        )
+        votes = {}
+        for vote in Vote.query.filter_by(session_id=session_id).order_by(Vote.id).all():
+            votes.setdefault(vote.issue_key, {})[vote.id] = vote.to_dict()
+        removed = {
+            removed_issue.issue_key: removed_issue.version
+            for removed_issue in RemovedIssue.query.filter_by(session_id=session_id).all()
+        }
+
+        return SessionSnapshot(voting_session.to_dict(), voting_session.creator_id, issues, votes, removed)
+
+    def render(self, snapshot, since=None):
+        """Copy the snapshot's contents, limited to changes after `since` if given
+
+        Returns (session_dict, issues, votes_by_issue, removed_issue_keys, version).
+        """
+        with self._lock:
+            issues = [issue for issue in snapshot.issues.values() if since is None or issue['version'] > since]
+            votes_by_issue = {}
+            for issue_key, issue_votes in snapshot.votes.items():
+                changed_votes = [vote for vote in issue_votes.values() if since is None or vote['version'] > since]
+                if changed_votes:
+                    votes_by_issue[issue_key] = changed_votes
+            removed = [issue_key for issue_key, version in snapshot.removed.items() if since is not None and version > since]
+            return dict(snapshot.session), issues, votes_by_issue, removed, snapshot.version
+
+    def apply_vote(self, session_id, vote):
+        """Write a committed vote (as a dict) through to the cached snapshot"""
+        with self._lock:
+            snapshot = self._write(session_id, vote['version'])
+            if snapshot is None:
+                return
+            issue_votes = snapshot.votes.setdefault(vote['issue_key'], {})
+            previous = issue_votes.get(vote['id'])
+            issue_votes[vote['id']] = vote
+            self._resize(snapshot, estimate_size(vote) - (estimate_size(previous) if previous else 0))
+            self._set_version(snapshot, vote['version'])
+
+    def update_issues(self, session_id, issues):
+        """Write committed issue changes (as dicts, all stamped with one version) through to the cached snapshot"""
+        if not issues:
+            return
+        with self._lock:
+            snapshot = self._write(session_id, issues[0]['version'])
+            if snapshot is None:
+                return
+            for issue in issues:
+                previous = snapshot.issues.get(issue['issue_key'])
+                snapshot.issues[issue['issue_key']] = issue
+                self._resize(snapshot, estimate_size(issue) - (estimate_size(previous) if previous else 0))
+            self._set_version(snapshot, issues[0]['version'])
+
+    def remove_issue(self, session_id, issue_key, version):
+        """Write a committed issue removal through to the cached snapshot"""
+        with self._lock:
+            snapshot = self._write(session_id, version)
+            if snapshot is None:
+                return
+            snapshot.removed[issue_key] = version
+            self._set_version(snapshot, version)
+            removed_size = estimate_size([snapshot.issues.pop(issue_key, None), snapshot.votes.pop(issue_key, None)])
+            self._resize(snapshot, -removed_size)
+
+    def invalidate(self, session_id):
+        """Drop a session's snapshot, e.g. after changes too broad to apply in place"""
+        with self._lock:
+            self._write(session_id)
+            self._discard(session_id)
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'sessions': len(self._snapshots),
+                'size_bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'stale': self.stale,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else None
+            }
+
+    def _write(self, session_id, version=None):
+        """Record a write and return the snapshot it can be applied to, if any
+
+        A change stamped with `version` only applies on top of the version
+        right before it. If the snapshot is behind by more (a change made by
+        another process, or a concurrent request committing out of order, was
+        never applied) or already past it, the snapshot is dropped so the
+        next read reloads it.
+        """
+        # Caller holds the lock
+        self._writes[session_id] = self._writes.get(session_id, 0) + 1
+        snapshot = self._snapshots.get(session_id)
+        if snapshot is not None and version is not None and version != snapshot.version + 1:
+            self._discard(session_id)
+            self.stale += 1
+            return None
+        return snapshot
+
+    def _set_version(self, snapshot, version):
+        if version > snapshot.version:
+            snapshot.version = version
+            snapshot.session['version'] = version
+
+    def _resize(self, snapshot, delta):
+        snapshot.size += delta
+        # An earlier change in the same write may have evicted the snapshot already
+        if self._snapshots.get(snapshot.session['session_id']) is snapshot:
+            self._size += delta
+            self._evict()
+
+    def _discard(self, session_id):
+        snapshot = self._snapshots.pop(session_id, None)
+        if snapshot is not None:
+            self._size -= snapshot.size
+
+    def _evict(self):
+        while self._size > self.max_bytes and self._snapshots:
+            _, snapshot = self._snapshots.popitem(last=False)
+            self._size -= snapshot.size
+            self.evictions += 1
+
+session_cache = SessionCache()
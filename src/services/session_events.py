@@ -0,0 +1,123 @@
+import json
+import queue
+import threading
+
+# Defaults used when the app config does not override them
+DEFAULT_BACKEND = 'memory'
+DEFAULT_HEARTBEAT_INTERVAL = 15  # Seconds between keep-alive comments on idle streams
+DEFAULT_SUBSCRIBER_QUEUE_SIZE = 100
+
+class Subscription:
+    """One listener's queue of messages on a channel"""
+
+    def __init__(self, broker, channel, maxsize):
+        self.broker = broker
+        self.channel = channel
+        self._queue = queue.Queue(maxsize=maxsize)
+
+    def put(self, message):
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            # A slow listener has missed messages; replace its backlog with a
+            # single resync message so it reloads the full state instead
+            with self._queue.mutex:
+                self._queue.queue.clear()
+            self._queue.put_nowait({'type': 'resync', 'data': {}})
+
+    def get(self, timeout=None):
+        """Next message, or None if nothing arrived within `timeout` seconds"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+class MemoryBroker:
+    """In-process pub/sub
+
+    Only reaches listeners connected to the same process. Deployments with
+    several worker processes need a broker with the same publish /
+    subscribe / unsubscribe methods backed by a shared service.
+    """
+
+    def __init__(self, queue_size=DEFAULT_SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscriptions = {}  # channel -> set of Subscription
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.put(message)
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel, self.queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+    def subscriber_count(self, channel):
+        with self._lock:
+            return len(self._subscriptions.get(channel, ()))
+
+BROKERS = {
+    'memory': MemoryBroker
+}
+
+class SessionEvents:
+    """Broadcasts vote, issue and close events to everyone watching a session"""
+
+    def __init__(self, app=None, broker=None):
+        self.broker = broker or MemoryBroker()
+        self.heartbeat_interval = DEFAULT_HEARTBEAT_INTERVAL
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, broker=None):
+        """Configure from the app; pass `broker` to plug in another pub/sub backend"""
+        if broker is None:
+            backend = app.config.get('SESSION_EVENTS_BACKEND', DEFAULT_BACKEND)
+            if backend not in BROKERS:
+                raise ValueError(f'Unknown session events backend: {backend}')
+            broker = BROKERS[backend](
+                queue_size=app.config.get('SESSION_EVENTS_QUEUE_SIZE', DEFAULT_SUBSCRIBER_QUEUE_SIZE)
+            )
+        self.broker = broker
+        self.heartbeat_interval = app.config.get('SESSION_EVENTS_HEARTBEAT', DEFAULT_HEARTBEAT_INTERVAL)
+        app.extensions['session_events'] = self
+
+    def publish(self, session_id, event_type, data=None):
+        """Send an event to the session's listeners. Call after the change is committed."""
+        self.broker.publish(session_id, {'type': event_type, 'data': data or {}})
+
+    def subscribe(self, session_id):
+        return self.broker.subscribe(session_id)
+
+    def stream(self, subscription):
+        """Yield Server-Sent Events for a subscription until the client disconnects"""
+        try:
+            # Tell the browser how long to wait before reconnecting, and flush the headers
+            yield 'retry: 3000\n\n'
+            while True:
+                message = subscription.get(timeout=self.heartbeat_interval)
+                if message is None:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ': keepalive\n\n'
+                    continue
+                yield f"event: {message['type']}\ndata: {json.dumps(message['data'])}\n\n"
+        finally:
+            subscription.close()
+
+session_events = SessionEvents()